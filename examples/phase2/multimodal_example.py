@@ -7,37 +7,124 @@ using the Ollama-OpenAI proxy. The proxy handles the translation between
 Ollama and OpenAI multimodal formats.
 """
 
-import base64
+import functools
 import io
+import mmap
+import os
+from typing import Tuple
 
+import numpy as np
 from ollama import Client
 from PIL import Image, ImageDraw
 
+try:
+    # pybase64 uses SIMD kernels (SSSE3/AVX2/NEON) and is a drop-in for base64;
+    # on CPUs without them it still runs a portable 64-bit (SWAR) kernel
+    import pybase64 as base64
 
-def create_sample_image():
-    """Create a simple sample image for demonstration purposes."""
-    # Create a 400x300 image with a gradient background
-    img = Image.new("RGB", (400, 300), color="lightblue")
-    draw = ImageDraw.Draw(img)
+    BASE64_BACKEND = f"pybase64 {base64.get_version()}"
+except ImportError:
+    import base64
 
-    # Draw some shapes
-    draw.rectangle([50, 50, 150, 150], fill="red", outline="darkred")
-    draw.ellipse([200, 100, 350, 200], fill="green", outline="darkgreen")
-    draw.text((160, 250), "Sample Image", fill="black")
+    BASE64_BACKEND = "stdlib base64"
+
+try:
+    # libjpeg-turbo encodes JPEGs with SIMD DCT/colour conversion
+    from turbojpeg import TJPF_RGB, TurboJPEG
+
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbo_jpeg = None
+
+JPEG_QUALITY = 75
+
+IMAGE_SIZE = (400, 300)
+
+# A shape is (x0, y0, x1, y1, fill, outline) with inclusive bounds, as in PIL
+RGB = Tuple[int, int, int]
+Shape = Tuple[int, int, int, int, RGB, RGB]
+
+
+def encode_jpeg(img: Image.Image):
+    """Encode an RGB PIL image as JPEG and return a bytes-like object.
+
+    The Pillow fallback returns a view of the BytesIO buffer rather than a
+    copy of it, so the JPEG is held in memory only once before base64.
+    """
+    if _turbo_jpeg is not None:
+        return _turbo_jpeg.encode(
+            np.asarray(img), quality=JPEG_QUALITY, pixel_format=TJPF_RGB
+        )
 
-    # Convert to base64
     buffer = io.BytesIO()
-    img.save(buffer, format="JPEG")
-    image_data = base64.b64encode(buffer.getvalue()).decode()
+    img.save(buffer, format="JPEG", quality=JPEG_QUALITY)
+    return buffer.getbuffer()
+
+
+def encode_base64(data) -> str:
+    """Encode raw bytes (or any buffer, e.g. an mmap) as a base64 string."""
+    return base64.b64encode(data).decode("ascii")
+
+
+def render_scene(background: RGB, rectangle: Shape, ellipse: Shape, label: str):
+    """Render a sample scene with numpy fills instead of per-shape PIL drawing.
+
+    Only the text label still goes through ImageDraw.
+    """
+    width, height = IMAGE_SIZE
+    canvas = np.empty((height, width, 3), dtype=np.uint8)
+    canvas[:] = background
+
+    x0, y0, x1, y1, fill, outline = rectangle
+    canvas[y0 : y1 + 1, x0 : x1 + 1] = outline
+    canvas[y0 + 1 : y1, x0 + 1 : x1] = fill
+
+    x0, y0, x1, y1, fill, outline = ellipse
+    region = canvas[y0 : y1 + 1, x0 : x1 + 1]
+    ys, xs = np.ogrid[: y1 - y0 + 1, : x1 - x0 + 1]
+    rx, ry = (x1 - x0) / 2, (y1 - y0) / 2
+    dx, dy = xs - rx, ys - ry
+    region[(dx / rx) ** 2 + (dy / ry) ** 2 <= 1] = outline
+    region[(dx / (rx - 1)) ** 2 + (dy / (ry - 1)) ** 2 <= 1] = fill
+
+    img = Image.fromarray(canvas)
+    ImageDraw.Draw(img).text((160, 250), label, fill="black")
+    return img
+
+
+@functools.lru_cache(maxsize=1)
+def create_sample_image():
+    """Create a simple sample image for demonstration purposes.
+
+    The image is deterministic, so it is rendered and encoded only once.
+    """
+    # Light blue background with a red square and a green ellipse
+    img = render_scene(
+        background=(173, 216, 230),
+        rectangle=(50, 50, 150, 150, (255, 0, 0), (139, 0, 0)),
+        ellipse=(200, 100, 350, 200, (0, 128, 0), (0, 100, 0)),
+        label="Sample Image",
+    )
+
+    # Convert to base64
+    image_data = encode_base64(encode_jpeg(img))
 
     return image_data
 
 
+@functools.lru_cache(maxsize=8)
 def load_image_file(file_path: str) -> str:
-    """Load an image file and convert it to base64."""
+    """Load an image file and convert it to base64.
+
+    The file is memory-mapped and encoded straight from the mapping, so the
+    raw bytes are never copied into a separate Python buffer.
+    """
     try:
         with open(file_path, "rb") as f:
-            image_data = base64.b64encode(f.read()).decode()
+            if os.fstat(f.fileno()).st_size == 0:
+                return ""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                image_data = encode_base64(mapped)
         return image_data
     except FileNotFoundError:
         print(
@@ -81,15 +168,14 @@ def main():
         image1 = create_sample_image()
 
         # Create a second image with different shapes
-        img2 = Image.new("RGB", (400, 300), color="lightyellow")
-        draw2 = ImageDraw.Draw(img2)
-        draw2.ellipse([50, 50, 150, 150], fill="blue", outline="darkblue")
-        draw2.rectangle([200, 100, 350, 200], fill="purple", outline="darkpurple")
-        draw2.text((160, 250), "Image 2", fill="black")
+        img2 = render_scene(
+            background=(255, 255, 224),
+            rectangle=(200, 100, 350, 200, (128, 0, 128), (75, 0, 130)),
+            ellipse=(50, 50, 150, 150, (0, 0, 255), (0, 0, 139)),
+            label="Image 2",
+        )
 
-        buffer2 = io.BytesIO()
-        img2.save(buffer2, format="JPEG")
-        image2 = base64.b64encode(buffer2.getvalue()).decode()
+        image2 = encode_base64(encode_jpeg(img2))
 
         response = client.chat(
             model="gpt-4-vision-preview",
@@ -111,19 +197,16 @@ def main():
 
     print("=== Example 3: Image + Text Conversation ===")
     try:
-        # Start with an image
-        image_data = create_sample_image()
-
-        # First message with image
+        # First message with image; the follow-up turn resends this same
+        # message, so the encoded image is shared rather than copied
+        first_message = {
+            "role": "user",
+            "content": "What shapes do you see in this image?",
+            "images": [create_sample_image()],
+        }
         response1 = client.chat(
             model="gpt-4-vision-preview",
-            messages=[
-                {
-                    "role": "user",
-                    "content": "What shapes do you see in this image?",
-                    "images": [image_data],
-                }
-            ],
+            messages=[first_message],
         )
 
         print(f"First response: {response1['message']['content']}")
@@ -132,11 +215,7 @@ def main():
         response2 = client.chat(
             model="gpt-4-vision-preview",
             messages=[
-                {
-                    "role": "user",
-                    "content": "What shapes do you see in this image?",
-                    "images": [image_data],
-                },
+                first_message,
                 response1["message"],  # Assistant's previous response
                 {"role": "user", "content": "What colors are those shapes?"},
             ],
@@ -177,7 +256,8 @@ if __name__ == "__main__":
     print("=" * 45)
     print("This example demonstrates sending images with text messages.")
     print("Make sure the Ollama-OpenAI proxy is running on localhost:11434")
-    print("and configured with a vision-capable model.\n")
+    print("and configured with a vision-capable model.")
+    print(f"Base64 encoder: {BASE64_BACKEND}\n")
 
     # Check if PIL is available
     try:
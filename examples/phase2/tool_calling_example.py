@@ -6,11 +6,30 @@ This example demonstrates how to use tool/function calling with the Ollama-OpenA
 The proxy translates between Ollama and OpenAI tool calling formats seamlessly.
 """
 
-import json
+import ast
+import functools
+from types import CodeType
 from typing import Any, Dict
 
 from ollama import Client
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+def _decode_args(tool_call: Any) -> Dict[str, Any]:
+    """Return a tool call's arguments as a dict.
+
+    Ollama-format responses already carry a dict, so decoding only happens
+    when the arguments arrive as an OpenAI-style JSON string.
+    """
+    arguments = tool_call["function"]["arguments"]
+    if isinstance(arguments, dict):
+        return arguments
+    return json_loads(arguments)
+
 
 def get_weather(location: str, unit: str = "celsius") -> Dict[str, Any]:
     """
@@ -27,14 +46,69 @@ def get_weather(location: str, unit: str = "celsius") -> Dict[str, Any]:
     }
 
 
+# AST node types allowed in calculate_math expressions (plain arithmetic only)
+_MATH_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Constant,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Pow,
+    ast.UAdd,
+    ast.USub,
+)
+
+# Largest exponent accepted, so a model-supplied "9**9**9" can't hang the example
+_MAX_EXPONENT = 100
+
+
+def _check_power(node: ast.BinOp) -> None:
+    """Reject powers with a non-literal or oversized exponent, or a nested base."""
+    exponent = node.right
+    if isinstance(exponent, ast.UnaryOp) and isinstance(
+        exponent.op, (ast.UAdd, ast.USub)
+    ):
+        exponent = exponent.operand
+    if not (
+        isinstance(exponent, ast.Constant)
+        and isinstance(exponent.value, (int, float))
+        and abs(exponent.value) <= _MAX_EXPONENT
+    ):
+        raise ValueError(f"Exponent must be a number no larger than {_MAX_EXPONENT}")
+    if any(
+        isinstance(inner, ast.BinOp) and isinstance(inner.op, ast.Pow)
+        for inner in ast.walk(node.left)
+    ):
+        raise ValueError("Nested powers are not supported")
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_math(expression: str) -> CodeType:
+    """Parse, validate and compile an arithmetic expression once per string."""
+    tree = ast.parse(expression, mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _MATH_NODES):
+            raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError(f"Unsupported constant: {node.value!r}")
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+            _check_power(node)
+    return compile(tree, "<math>", "eval")
+
+
 def calculate_math(expression: str) -> Dict[str, Any]:
     """
     Mock calculation function for demonstration.
-    In a real application, this would safely evaluate mathematical expressions.
+    Only arithmetic on numeric literals is accepted; each distinct expression
+    is parsed and compiled once and the code object is reused.
     """
     try:
-        # Simple safe evaluation for demo (DO NOT use eval() in production!)
-        result = eval(expression)
+        result = eval(_compile_math(expression), {"__builtins__": {}}, {})
         return {"expression": expression, "result": result, "success": True}
     except Exception as e:
         return {"expression": expression, "error": str(e), "success": False}
@@ -107,7 +181,7 @@ def main():
 
             for tool_call in tool_calls:
                 function_name = tool_call["function"]["name"]
-                arguments = json.loads(tool_call["function"]["arguments"])
+                arguments = _decode_args(tool_call)
 
                 print(f"  Function: {function_name}")
                 print(f"  Arguments: {arguments}")
@@ -138,7 +212,7 @@ def main():
             tool_calls = response.message.tool_calls
             for tool_call in tool_calls:
                 function_name = tool_call["function"]["name"]
-                arguments = json.loads(tool_call["function"]["arguments"])
+                arguments = _decode_args(tool_call)
 
                 print(f"  Function: {function_name}")
                 print(f"  Arguments: {arguments}")
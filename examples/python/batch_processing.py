@@ -6,13 +6,29 @@ Demonstrates concurrent processing and error handling.
 
 import asyncio
 import time
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import aiohttp
 
+try:
+    import orjson
+
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    json_loads = json.loads
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 # Configuration
 PROXY_URL = "http://localhost:11434"
 MODEL = "gpt-3.5-turbo"
+MAX_CONCURRENT = 16
 
 # Example prompts for batch processing
 PROMPTS = [
@@ -23,30 +39,71 @@ PROMPTS = [
     "Describe the water cycle in simple terms",
 ]
 
+# Request fields shared by every prompt, serialized once at import
+_BASE_PAYLOAD = {
+    "model": MODEL,
+    "stream": False,
+    "options": {"temperature": 0.7, "num_predict": 100},
+}
+_BASE_PAYLOAD_BYTES = json_dumps(_BASE_PAYLOAD)
+
+
+def encode_payload(prompt: str) -> bytes:
+    """Serialize a generate request by splicing the prompt into the base payload."""
+    return b'{"prompt":' + json_dumps(prompt) + b"," + _BASE_PAYLOAD_BYTES[1:]
+
+
+# Request bodies for the built-in prompts, fully serialized at import
+_PROMPT_PAYLOADS: Dict[str, bytes] = {
+    prompt: encode_payload(prompt) for prompt in PROMPTS
+}
+
+
+# Shared HTTP session, reused across batches so keep-alive connections stay warm
+_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the shared client session, creating it on first use."""
+    global _session
+
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=2 * MAX_CONCURRENT,
+            limit_per_host=MAX_CONCURRENT,
+            keepalive_timeout=75,
+        )
+        _session = aiohttp.ClientSession(connector=connector)
+
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared client session and its pooled connections."""
+    global _session
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
 
 async def generate_single(
     session: aiohttp.ClientSession, prompt: str, index: int
 ) -> Dict[str, Any]:
     """Generate response for a single prompt."""
 
-    payload = {
-        "model": MODEL,
-        "prompt": prompt,
-        "stream": False,
-        "options": {"temperature": 0.7, "num_predict": 100},
-    }
-
     try:
         start_time = time.time()
 
         async with session.post(
             f"{PROXY_URL}/api/generate",
-            json=payload,
+            data=_PROMPT_PAYLOADS.get(prompt) or encode_payload(prompt),
+            headers=JSON_HEADERS,
             timeout=aiohttp.ClientTimeout(total=30),
         ) as response:
 
             if response.status == 200:
-                result = await response.json()
+                result = json_loads(await response.read())
                 elapsed = time.time() - start_time
 
                 return {
@@ -88,25 +145,43 @@ async def generate_single(
         }
 
 
-async def process_batch(
-    prompts: List[str], max_concurrent: int = 3
-) -> List[Dict[str, Any]]:
-    """Process multiple prompts with concurrency limit."""
+async def iter_batch(
+    prompts: List[str], max_concurrent: int = MAX_CONCURRENT
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield results for multiple prompts as soon as each one completes."""
 
     # Create semaphore to limit concurrent requests
-    semaphore = asyncio.Semaphore(max_concurrent)
+    semaphore = asyncio.Semaphore(max(1, min(len(prompts), max_concurrent)))
 
     async def bounded_generate(session, prompt, index):
         async with semaphore:
             return await generate_single(session, prompt, index)
 
-    # Create session and process all prompts
-    async with aiohttp.ClientSession() as session:
-        tasks = [
-            bounded_generate(session, prompt, i) for i, prompt in enumerate(prompts)
-        ]
+    # Reuse the pooled session and schedule all prompts up front
+    session = await get_session()
+    tasks = [
+        asyncio.ensure_future(bounded_generate(session, prompt, i))
+        for i, prompt in enumerate(prompts)
+    ]
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
 
-        results = await asyncio.gather(*tasks)
+
+async def process_batch(
+    prompts: List[str], max_concurrent: int = MAX_CONCURRENT
+) -> List[Dict[str, Any]]:
+    """Process multiple prompts with concurrency limit, returned in input order."""
+
+    # Slot each result by its prompt index so the list comes back in input order
+    results: List[Dict[str, Any]] = [{}] * len(prompts)
+    async for result in iter_batch(prompts, max_concurrent=max_concurrent):
+        print(f"  completed [{result['index'] + 1}/{len(prompts)}]")
+        results[result["index"]] = result
 
     return results
 
@@ -122,7 +197,7 @@ def print_results(results: List[Dict[str, Any]]):
     print("BATCH PROCESSING RESULTS")
     print("=" * 80)
 
-    for result in sorted(results, key=lambda x: x["index"]):
+    for result in results:
         print(f"\n[{result['index'] + 1}] Prompt: {result['prompt'][:50]}...")
 
         if result["success"]:
@@ -149,14 +224,20 @@ def print_results(results: List[Dict[str, Any]]):
 async def main():
     """Main execution."""
 
-    print(f"Processing {len(PROMPTS)} prompts with max 3 concurrent requests...")
+    print(
+        f"Processing {len(PROMPTS)} prompts with max {MAX_CONCURRENT} "
+        "concurrent requests..."
+    )
     print(f"Using model: {MODEL}")
     print(f"Proxy URL: {PROXY_URL}")
 
     start_time = time.time()
 
     # Process batch
-    results = await process_batch(PROMPTS, max_concurrent=3)
+    try:
+        results = await process_batch(PROMPTS)
+    finally:
+        await close_session()
 
     total_time = time.time() - start_time
 
@@ -3,20 +3,25 @@
 Streaming chat example with conversation history.
 """
 
+from collections import deque
 
 from ollama import Client
 
 # Initialize client
 client = Client(host="http://localhost:11434")
 
-# Conversation history
-messages = [
+# System prompt, sent ahead of the rolling conversation history
+SYSTEM_MESSAGES = [
     {
         "role": "system",
         "content": "You are a helpful AI assistant. Keep responses concise.",
     }
 ]
 
+# Conversation history; the oldest turns drop off automatically
+MAX_HISTORY = 18
+history = deque(maxlen=MAX_HISTORY)
+
 print("Ollama OpenAI Proxy - Chat Interface")
 print("Type 'quit' to exit, 'clear' to reset conversation")
 print("-" * 50)
@@ -30,38 +35,38 @@ while True:
         break
 
     if user_input.lower() == "clear":
-        messages = messages[:1]  # Keep system message
+        history.clear()  # System message is kept separately
         print("Conversation cleared.")
         continue
 
     # Add user message
-    messages.append({"role": "user", "content": user_input})
+    history.append({"role": "user", "content": user_input})
 
     # Stream response
     print("Assistant: ", end="", flush=True)
 
     try:
-        # Collect full response for history
-        full_response = ""
+        # Collect response chunks for history
+        response_parts = []
 
         # Stream the response
-        stream = client.chat(model="gpt-3.5-turbo", messages=messages, stream=True)
+        stream = client.chat(
+            model="gpt-3.5-turbo",
+            messages=SYSTEM_MESSAGES + list(history),
+            stream=True,
+        )
 
         for chunk in stream:
             if "message" in chunk and "content" in chunk["message"]:
                 content = chunk["message"]["content"]
                 print(content, end="", flush=True)
-                full_response += content
+                response_parts.append(content)
 
         print()  # New line after response
+        full_response = "".join(response_parts)
 
         # Add assistant response to history
-        messages.append({"role": "assistant", "content": full_response})
-
-        # Keep conversation size manageable
-        if len(messages) > 20:
-            # Keep system message and last 18 messages
-            messages = messages[:1] + messages[-18:]
+        history.append({"role": "assistant", "content": full_response})
 
     except KeyboardInterrupt:
         print("\n\nInterrupted!")
@@ -69,4 +74,4 @@ while True:
     except Exception as e:
         print(f"\nError: {e}")
         # Remove the failed user message
-        messages.pop()
+        history.pop()
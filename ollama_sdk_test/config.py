@@ -2,7 +2,7 @@
 Test configuration for Ollama SDK compatibility tests.
 """
 import os
-from typing import List
+from typing import List, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables from .env file if it exists
@@ -47,6 +47,11 @@ SAMPLE_TEXTS = [
     "Embeddings represent text as numerical vectors",
 ]
 
+# 100 distinct texts for large batch tests, built once at import
+LARGE_BATCH_TEXTS: Tuple[str, ...] = tuple(
+    f"Test text number {i}: {text}" for i, text in enumerate(SAMPLE_TEXTS * 20)
+)
+
 UNICODE_TEST_TEXTS = [
     "Hello, 世界! 🌍",  # Mixed languages with emoji
     "Привет мир",  # Cyrillic
@@ -0,0 +1,53 @@
+"""
+Shared pytest fixtures for Ollama SDK compatibility tests.
+"""
+from typing import FrozenSet
+
+import pytest
+from ollama import AsyncClient, Client
+from utils.test_helpers import create_test_client
+
+
+def pytest_configure(config):
+    """Register markers used by the SDK suite."""
+    config.addinivalue_line(
+        "markers",
+        "slow: extra network round-trips (skipped by run_tests.py unless --all)"
+    )
+
+
+@pytest.fixture(scope="session")
+def shared_client() -> Client:
+    """
+    One Ollama client for the whole test session.
+
+    Reusing the client keeps its underlying httpx connection pool alive, so
+    tests share keep-alive connections instead of each opening their own.
+    """
+    return create_test_client()
+
+
+@pytest.fixture(scope="session")
+def shared_async_client() -> AsyncClient:
+    """
+    One async Ollama client for the whole test session.
+
+    Its connection pool is bound to the event loop it first runs on, so it
+    must only be used by tests that run on the session-scoped loop.
+    """
+    from config import PROXY_HOST
+    return AsyncClient(host=PROXY_HOST)
+
+
+@pytest.fixture(scope="session")
+def models_response(shared_client):
+    """Result of list(), fetched once and shared by read-only model tests."""
+    return shared_client.list()
+
+
+@pytest.fixture(scope="session")
+def available_model_names(models_response) -> FrozenSet[str]:
+    """Names of the models served by the proxy, for O(1) membership checks."""
+    if hasattr(models_response, 'models'):
+        return frozenset(model.model for model in models_response.models)
+    return frozenset(model["name"] for model in models_response["models"])
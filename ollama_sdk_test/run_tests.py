@@ -5,112 +5,287 @@ Main test runner for Ollama SDK compatibility tests.
 import sys
 import os
 import argparse
+import atexit
+import json
 import logging
+import queue
 import subprocess
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from importlib.metadata import PackageNotFoundError, version
+from importlib.util import find_spec
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config import LOG_LEVEL, LOG_FORMAT, PROXY_HOST
 
+# Directory containing this runner, resolved once
+RUNNER_DIR = sys.path[0]
+
+
+_logging_configured = False
+
 
 def setup_logging(verbose: bool = False):
-    """Set up logging configuration."""
+    """
+    Set up logging configuration.
+
+    The stdout handler is attached once, and only if the root logger has no
+    handlers yet; later calls just adjust the level. Records are handed to a
+    QueueHandler and written by a background QueueListener, so logging from
+    tests never blocks on a slow terminal or CI log sink.
+    """
+    global _logging_configured
+
     level = logging.DEBUG if verbose else getattr(logging, LOG_LEVEL)
-    logging.basicConfig(
-        level=level,
-        format=LOG_FORMAT,
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    root = logging.getLogger()
+    root.setLevel(level)
 
+    if _logging_configured:
+        return
+    _logging_configured = True
 
-def check_proxy_connection() -> bool:
-    """Check if the proxy server is accessible."""
+    if not root.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, handler)
+        root.addHandler(QueueHandler(log_queue))
+        listener.start()
+        atexit.register(listener.stop)
+
+
+def _probe_proxy(host: str) -> Optional[str]:
+    """
+    Probe the proxy root with a single HEAD request.
+
+    No response body is read. Any HTTP response, including 405 from a
+    server that only allows GET on "/", proves the proxy is reachable.
+
+    Returns:
+        None if the proxy is reachable, otherwise the error message
+    """
     import httpx
-    
+
     try:
-        # Try to connect to the proxy
-        response = httpx.get(f"{PROXY_HOST}/", timeout=5)
+        httpx.head(f"{host}/", timeout=httpx.Timeout(2.0, connect=1.0))
+        return None
+    except Exception as e:
+        return str(e)
+
+
+def check_proxy_connection() -> bool:
+    """Check if the proxy server is accessible."""
+    error = _probe_proxy(PROXY_HOST)
+    if error is None:
         logging.info(f"✓ Proxy server is accessible at {PROXY_HOST}")
         return True
-    except Exception as e:
-        logging.error(f"✗ Cannot connect to proxy at {PROXY_HOST}: {e}")
-        return False
 
+    logging.error(f"✗ Cannot connect to proxy at {PROXY_HOST}: {error}")
+    return False
+
+
+REQUIREMENTS_FILE = os.path.join(RUNNER_DIR, "requirements.txt")
+
+
+def find_missing_requirements(path: str = REQUIREMENTS_FILE) -> List[str]:
+    """
+    List requirements from a requirements file that are not satisfied.
+
+    Installed versions are read with importlib.metadata, so no subprocess is
+    needed when everything is already in place.
+
+    Args:
+        path: Path to a requirements file
+
+    Returns:
+        Requirement strings that are missing or at a non-matching version
+    """
+    with open(path) as f:
+        lines = [line.split("#", 1)[0].strip() for line in f]
+    requirements = [line for line in lines if line]
 
-def install_dependencies():
-    """Install test dependencies."""
-    logging.info("Installing test dependencies...")
     try:
-        subprocess.run(
-            [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"],
-            check=True,
-            capture_output=True,
-            text=True
+        from packaging.requirements import Requirement
+    except ImportError:
+        # Without packaging we cannot compare versions; let pip decide
+        return requirements
+
+    missing = []
+    for line in requirements:
+        req = Requirement(line)
+        try:
+            installed = version(req.name)
+        except PackageNotFoundError:
+            missing.append(line)
+            continue
+        if not req.specifier.contains(installed, prereleases=True):
+            missing.append(line)
+    return missing
+
+
+def install_dependencies():
+    """Install test dependencies that are missing or out of date."""
+    missing = find_missing_requirements()
+    if not missing:
+        logging.info("✓ Dependencies already installed")
+        return
+
+    logging.info(f"Installing test dependencies: {', '.join(missing)}")
+    cmd = [sys.executable, "-m", "pip", "install", "--prefer-binary", *missing]
+
+    # Stream pip's output line by line instead of buffering the whole log
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=1,
+        text=True
+    ) as proc:
+        for line in proc.stdout:
+            logging.debug(line.rstrip())
+        returncode = proc.wait()
+
+    if returncode != 0:
+        logging.error(
+            f"✗ Failed to install dependencies: pip exited with code {returncode}"
         )
-        logging.info("✓ Dependencies installed successfully")
-    except subprocess.CalledProcessError as e:
-        logging.error(f"✗ Failed to install dependencies: {e}")
-        logging.error(f"Error output: {e.stderr}")
+        logging.error("Re-run with -v to see pip's output")
         sys.exit(1)
 
+    logging.info("✓ Dependencies installed successfully")
+
+
+# Last successful run's resolved options, reused by --resume
+RUNNER_CONFIG_FILE = os.path.join(
+    RUNNER_DIR, ".pytest_cache", "runner_config.json"
+)
+RESUMABLE_OPTIONS = ("tests", "markers", "verbose", "failfast", "run_all", "jobs")
+
+
+def load_runner_config(path: str = RUNNER_CONFIG_FILE) -> Dict[str, Any]:
+    """
+    Load the options saved by the last successful run.
+
+    Returns:
+        Saved options, or an empty dict if none were saved
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_runner_config(args: argparse.Namespace, path: str = RUNNER_CONFIG_FILE):
+    """Persist the resolved options of this run for --resume."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({name: getattr(args, name) for name in RESUMABLE_OPTIONS}, f)
+
 
 def run_pytest(
     test_files: Optional[List[str]] = None,
     markers: Optional[str] = None,
     verbose: bool = False,
     failfast: bool = False,
-    coverage: bool = False
+    coverage: bool = False,
+    jobs: Optional[str] = None,
+    run_all: bool = False,
+    last_failed: bool = False,
+    failed_first: bool = False,
+    cache_clear: bool = False,
+    profile: bool = False,
+    collect_only: bool = False
 ) -> int:
     """
     Run pytest with specified options.
-    
+
     Args:
         test_files: Specific test files to run
-        markers: Pytest markers to filter tests
+        markers: Pytest markers to filter tests (default: "not slow")
         verbose: Enable verbose output
         failfast: Stop on first failure
         coverage: Enable coverage reporting
-        
+        jobs: Number of pytest-xdist workers ("auto" for one per CPU,
+            "0" to run serially). Defaults to $PYTEST_WORKERS or "auto".
+        run_all: Include tests marked slow when no markers are given
+        last_failed: Only re-run tests that failed last time
+        failed_first: Run last run's failures first, then the rest
+        cache_clear: Clear the pytest cache before running
+        profile: Report the slowest tests (those taking 0.1s or more)
+        collect_only: Only collect and list tests, without running them
+
     Returns:
         Exit code from pytest
     """
+    import pytest
+
     cmd = [sys.executable, "-m", "pytest"]
-    
+
     # Add options
     if verbose:
         cmd.append("-vv")
     else:
         cmd.append("-v")
-    
+
     if failfast:
         cmd.append("-x")
-    
+
     if markers:
         cmd.extend(["-m", markers])
-    
+    elif not run_all:
+        cmd.extend(["-m", "not slow"])
+
     if coverage:
         cmd.extend(["--cov=.", "--cov-report=html", "--cov-report=term"])
-    
+
+    if last_failed:
+        cmd.append("--last-failed")
+
+    if failed_first:
+        cmd.append("--failed-first")
+
+    if cache_clear:
+        cmd.append("--cache-clear")
+
+    if profile:
+        cmd.extend(["--durations=25", "--durations-min=0.1"])
+
+    if collect_only:
+        cmd.extend(["--collect-only", "-q"])
+
+    # Run tests in parallel; loadfile keeps each file's tests (and the
+    # clients they share) on a single worker
+    jobs = jobs or os.environ.get("PYTEST_WORKERS", "auto")
+    if jobs != "0":
+        if find_spec("xdist") is not None:
+            cmd.extend(["-n", jobs, "--dist=loadfile"])
+        else:
+            logging.warning("pytest-xdist not installed; running tests serially")
+
     # Add test files or run all
     if test_files:
         cmd.extend(test_files)
     else:
         # Run all test files
         cmd.append(".")
-    
+
     # Add color output
     cmd.append("--color=yes")
-    
+
     # Show warnings
-    cmd.append("-W default")
-    
-    # Run pytest
+    cmd.extend(["-W", "default"])
+
+    # Run pytest in-process to avoid a second interpreter start-up and
+    # re-importing ollama/httpx/plugins; cmd is kept for logging
     logging.info(f"Running: {' '.join(cmd)}")
-    return subprocess.call(cmd)
+    return int(pytest.main(cmd[3:]))
 
 
 def main():
@@ -122,84 +297,171 @@ def main():
 Examples:
   # Run all tests
   python run_tests.py
-  
+
   # Run only embedding tests
   python run_tests.py test_embeddings.py
-  
+
   # Run with verbose output
   python run_tests.py -v
-  
-  # Run only basic tests quickly
-  python run_tests.py -m "not slow"
-  
+
+  # Run everything, including tests marked slow
+  python run_tests.py --all
+
   # Run with coverage report
   python run_tests.py --coverage
-  
+
+  # Run serially instead of across all CPUs
+  python run_tests.py --jobs 0
+
+  # Re-run only the tests that failed last time
+  python run_tests.py --lf
+
+  # Show which tests are slowest
+  python run_tests.py --profile
+
+  # Repeat the last successful run's options
+  python run_tests.py --resume
+
   # Install dependencies and run
   python run_tests.py --install
         """
     )
-    
+
     parser.add_argument(
         "tests",
         nargs="*",
         help="Specific test files to run (default: all tests)"
     )
-    
+
     parser.add_argument(
         "-v", "--verbose",
         action="store_true",
         help="Enable verbose output"
     )
-    
+
     parser.add_argument(
         "-m", "--markers",
-        help="Run tests matching given mark expression (e.g., 'not slow')"
+        help="Run tests matching given mark expression (default: 'not slow')"
     )
-    
+
+    parser.add_argument(
+        "--all",
+        dest="run_all",
+        action="store_true",
+        help="Include tests marked slow (excluded by default)"
+    )
+
     parser.add_argument(
         "-x", "--failfast",
         action="store_true",
         help="Stop on first test failure"
     )
-    
+
+    parser.add_argument(
+        "--lf", "--last-failed",
+        dest="last_failed",
+        action="store_true",
+        help="Only re-run the tests that failed last time"
+    )
+
+    parser.add_argument(
+        "--ff", "--failed-first",
+        dest="failed_first",
+        action="store_true",
+        help="Run last run's failures first, then the remaining tests"
+    )
+
+    parser.add_argument(
+        "--cache-clear",
+        action="store_true",
+        help="Clear the pytest cache (including last-failed state) first"
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Report the 25 slowest tests (taking at least 0.1s)"
+    )
+
+    parser.add_argument(
+        "--collect-only",
+        action="store_true",
+        help="List the collected tests without running them"
+    )
+
     parser.add_argument(
         "--coverage",
         action="store_true",
         help="Generate coverage report"
     )
-    
+
+    parser.add_argument(
+        "-j", "--jobs",
+        help="Number of parallel test workers, 'auto' for one per CPU or 0 "
+             "to disable (default: $PYTEST_WORKERS or auto)"
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse options from the last successful run for any not given"
+    )
+
     parser.add_argument(
         "--install",
         action="store_true",
         help="Install dependencies before running tests"
     )
-    
+
     parser.add_argument(
         "--no-check",
         action="store_true",
         help="Skip proxy connection check"
     )
-    
+
     args = parser.parse_args()
-    
+
+    # Resolve test paths once so pytest starts from absolute paths
+    args.tests = [os.fspath(Path(test).resolve()) for test in args.tests]
+
+    # Fill in options not given on the command line from the last good run
+    if args.resume:
+        for name, value in load_runner_config().items():
+            if name in RESUMABLE_OPTIONS and not getattr(args, name):
+                setattr(args, name, value)
+
     # Set up logging
     setup_logging(args.verbose)
-    
+
     logging.info("=== Ollama SDK Compatibility Test Suite ===")
-    
+
     # Install dependencies if requested
     if args.install:
         install_dependencies()
-    
-    # Check proxy connection unless skipped
+
+    # Probe the proxy in the background while pytest and its plugins import
+    probe = None
     if not args.no_check:
-        if not check_proxy_connection():
+        executor = ThreadPoolExecutor(max_workers=1)
+        probe = executor.submit(check_proxy_connection)
+        executor.shutdown(wait=False)
+
+    import pytest  # noqa: F401
+
+    # Check proxy connection unless skipped
+    if probe is not None:
+        try:
+            proxy_ok = probe.result(timeout=6)
+        except FutureTimeoutError:
+            logging.error(f"✗ Timed out connecting to proxy at {PROXY_HOST}")
+            proxy_ok = False
+
+        if not proxy_ok:
             logging.error("\nPlease ensure the proxy server is running at:")
             logging.error(f"  {PROXY_HOST}")
             logging.error("\nYou can skip this check with --no-check")
             sys.exit(1)
-    
+
     # Run tests
     logging.info("\nRunning tests...")
     exit_code = run_pytest(
@@ -207,15 +469,23 @@ Examples:
         markers=args.markers,
         verbose=args.verbose,
         failfast=args.failfast,
-        coverage=args.coverage
+        coverage=args.coverage,
+        jobs=args.jobs,
+        run_all=args.run_all,
+        last_failed=args.last_failed,
+        failed_first=args.failed_first,
+        cache_clear=args.cache_clear,
+        profile=args.profile,
+        collect_only=args.collect_only
     )
-    
+
     # Report results
     if exit_code == 0:
+        save_runner_config(args)
         logging.info("\n✓ All tests passed!")
     else:
         logging.error(f"\n✗ Tests failed with exit code: {exit_code}")
-    
+
     return exit_code
 
 
@@ -3,6 +3,7 @@ Basic connectivity and operation tests for Ollama SDK.
 """
 import pytest
 import logging
+import httpx
 from ollama import Client, AsyncClient
 
 from config import (
@@ -12,7 +13,7 @@ from config import (
     TIMEOUT,
 )
 from utils.test_helpers import (
-    create_test_client,
+    has_valid_model_entries,
     is_valid_model_list_response,
     retry_on_failure,
 )
@@ -20,12 +21,26 @@ from utils.test_helpers import (
 logger = logging.getLogger(__name__)
 
 
+def refuse_connection(request: httpx.Request) -> httpx.Response:
+    """MockTransport handler that fails like a refused TCP connection."""
+    raise httpx.ConnectError("Connection refused", request=request)
+
+
 class TestBasicOperations:
     """Test basic connectivity and operations."""
     
-    def setup_method(self):
-        """Set up test client before each test."""
-        self.client = create_test_client()
+    @pytest.fixture(autouse=True)
+    def _use_shared_client(self, shared_client):
+        """Use the session-wide client for each test."""
+        self.client = shared_client
+    
+    @pytest.fixture(scope="class")
+    def headers_client(self):
+        """Client configured with a custom header, built once per class."""
+        return Client(
+            host=PROXY_HOST,
+            headers={"X-Custom-Header": "test-value"}
+        )
     
     def test_client_initialization(self):
         """Test client can be initialized with different hosts."""
@@ -49,32 +64,33 @@ class TestBasicOperations:
         except Exception as e:
             pytest.fail(f"Failed to connect to proxy server: {e}")
     
-    def test_list_models(self):
+    def test_list_models(self, models_response, available_model_names):
         """Test listing available models."""
-        response = self.client.list()
-        
         # Validate response structure
-        assert is_valid_model_list_response(response), \
+        assert is_valid_model_list_response(models_response), \
             "Invalid model list response structure"
+        assert has_valid_model_entries(models_response), \
+            "Invalid model entry in model list response"
         
-        # Handle both SDK objects and dict responses
-        if hasattr(response, 'models'):
-            models = response.models
-            model_names = [model.model for model in models]
-        else:
-            models = response["models"]
-            model_names = [model["name"] for model in models]
-            
-        assert len(models) > 0, "Should have at least one model available"
+        model_names = available_model_names
+        assert len(model_names) > 0, "Should have at least one model available"
         
         # Log available models
-        logger.info(f"Available models: {', '.join(model_names)}")
+        logger.info(f"Available models: {', '.join(sorted(model_names))}")
+        
+        # At least one model should be available
+        assert any(test_model in model_names for test_model in TEST_CHAT_MODELS), \
+            "At least one test model should be available"
+    
+    @pytest.mark.parametrize("test_model", TEST_CHAT_MODELS)
+    def test_model_availability(self, available_model_names, test_model):
+        """Test whether a model from our test list is actually available."""
+        if test_model not in available_model_names:
+            pytest.skip(f"Model '{test_model}' is NOT available")
         
-        # Check if our test models are available
-        for test_model in TEST_CHAT_MODELS:
-            if test_model in model_names:
-                logger.info(f"Test model '{test_model}' is available")
+        logger.info(f"✓ Model '{test_model}' is available")
     
+    @pytest.mark.slow
     def test_show_model_info(self):
         """Test getting detailed model information."""
         try:
@@ -96,40 +112,21 @@ class TestBasicOperations:
             # Some proxies might not implement show()
             logger.warning(f"show() method not supported or failed: {e}")
     
-    def test_model_availability(self):
-        """Test which models from our test list are actually available."""
-        response = self.client.list()
-        
-        # Handle both SDK objects and dict responses
-        if hasattr(response, 'models'):
-            available_models = [model.model for model in response.models]
-        else:
-            available_models = [model["name"] for model in response["models"]]
-        
-        results = {}
-        for test_model in TEST_CHAT_MODELS:
-            is_available = test_model in available_models
-            results[test_model] = is_available
-            
-            if is_available:
-                logger.info(f"✓ Model '{test_model}' is available")
-            else:
-                logger.warning(f"✗ Model '{test_model}' is NOT available")
-        
-        # At least one model should be available
-        assert any(results.values()), \
-            "At least one test model should be available"
-    
     def test_error_handling_connection(self):
         """Test error handling for connection failures."""
-        # Create client with invalid host (use valid port range)
-        bad_client = Client(host="http://localhost:59999")
+        # Fail at the transport layer instead of relying on the OS refusing
+        # a local port, which can hang on hosts that filter it
+        bad_client = Client(
+            host="http://localhost:59999",
+            transport=httpx.MockTransport(refuse_connection)
+        )
         
         with pytest.raises(Exception) as exc_info:
             bad_client.list()
         
         logger.info(f"Connection error correctly raised: {type(exc_info.value).__name__}")
     
+    @pytest.mark.slow
     def test_retry_mechanism(self):
         """Test that retry mechanism works for transient failures."""
         # This is a basic test - in real scenario we'd mock failures
@@ -143,54 +140,50 @@ class TestBasicOperations:
         logger.info("Retry mechanism working")
     
     def test_timeout_handling(self):
-        """Test timeout configuration."""
-        # Create client with short timeout
-        # Note: This might not actually timeout unless the server is slow
-        import httpx
-        
-        # The Ollama client might not directly expose timeout setting,
-        # but we can test that it handles the configuration
-        try:
-            client = Client(
-                host=PROXY_HOST,
-                timeout=0.001  # Very short timeout
-            )
-            # This might or might not fail depending on network speed
+        """Test that client timeouts surface as httpx timeout errors."""
+        def time_out(request):
+            raise httpx.ReadTimeout("simulated timeout", request=request)
+        
+        # The Ollama client forwards extra kwargs to httpx.Client, so a mock
+        # transport makes the timeout deterministic without touching the network
+        client = Client(
+            host=PROXY_HOST,
+            timeout=0.001,
+            transport=httpx.MockTransport(time_out)
+        )
+        
+        with pytest.raises(httpx.TimeoutException) as exc_info:
             client.list()
-        except Exception as e:
-            logger.info(f"Timeout test resulted in: {type(e).__name__}")
+        
+        logger.info(f"Timeout test resulted in: {type(exc_info.value).__name__}")
     
-    def test_headers_configuration(self):
+    @pytest.mark.slow
+    def test_headers_configuration(self, headers_client):
         """Test custom headers configuration."""
         # The Ollama client might support custom headers
         try:
-            client = Client(
-                host=PROXY_HOST,
-                headers={"X-Custom-Header": "test-value"}
-            )
-            response = client.list()
+            response = headers_client.list()
             assert response is not None
             logger.info("Custom headers accepted")
         except Exception as e:
             logger.warning(f"Custom headers not supported: {e}")
 
 
+@pytest.mark.asyncio(loop_scope="session")
 class TestAsyncBasicOperations:
-    """Test async client basic operations."""
+    """Test async client basic operations on one shared event loop."""
     
     @pytest.fixture
-    def async_client(self):
-        """Create async client for testing."""
-        return AsyncClient(host=PROXY_HOST)
+    def async_client(self, shared_async_client):
+        """Async client shared across the session."""
+        return shared_async_client
     
-    @pytest.mark.asyncio
     async def test_async_client_initialization(self):
         """Test async client initialization."""
         client = AsyncClient(host=PROXY_HOST)
         assert client is not None
         logger.info("Async client initialization successful")
     
-    @pytest.mark.asyncio
     async def test_async_list_models(self, async_client):
         """Test async model listing."""
         response = await async_client.list()
@@ -208,10 +201,12 @@ class TestAsyncBasicOperations:
         
         logger.info(f"Async list found {len(models)} models")
     
-    @pytest.mark.asyncio
     async def test_async_error_handling(self):
         """Test async error handling."""
-        bad_client = AsyncClient(host="http://localhost:59999")
+        bad_client = AsyncClient(
+            host="http://localhost:59999",
+            transport=httpx.MockTransport(refuse_connection)
+        )
         
         with pytest.raises(Exception) as exc_info:
             await bad_client.list()
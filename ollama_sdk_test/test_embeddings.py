@@ -1,6 +1,8 @@
 """
 Comprehensive embedding tests for Ollama SDK compatibility.
 """
+import asyncio
+import time
 import pytest
 import logging
 from typing import List, Dict, Any
@@ -12,6 +14,7 @@ from config import (
     DEFAULT_EMBEDDING_MODEL,
     TEST_EMBEDDING_MODELS,
     SAMPLE_TEXTS,
+    LARGE_BATCH_TEXTS,
     UNICODE_TEST_TEXTS,
     LONG_TEXT,
     EXPECTED_DIMENSIONS,
@@ -19,14 +22,16 @@ from config import (
     TIMEOUT,
 )
 from utils.test_helpers import (
-    create_test_client,
+    cached_embed,
     retry_on_failure,
     validate_embedding_response,
-    calculate_cosine_similarity,
+    cosine_similarity_matrix,
     assert_embeddings_similar,
     assert_embeddings_different,
-    measure_response_time,
+    embed_chunked,
     extract_embedding,
+    extract_embeddings_matrix,
+    measure_response_time,
 )
 
 logger = logging.getLogger(__name__)
@@ -35,9 +40,10 @@ logger = logging.getLogger(__name__)
 class TestEmbeddings:
     """Test suite for Ollama SDK embedding functionality."""
     
-    def setup_method(self):
-        """Set up test client before each test."""
-        self.client = create_test_client()
+    @pytest.fixture(autouse=True)
+    def _use_shared_client(self, shared_client):
+        """Use the session-wide client for each test."""
+        self.client = shared_client
         self.test_text = SAMPLE_TEXTS[0]
         self.test_model = DEFAULT_EMBEDDING_MODEL
     
@@ -45,10 +51,7 @@ class TestEmbeddings:
     
     def test_embed_single_string(self):
         """Test embedding a single string using embed() method."""
-        response = self.client.embed(
-            model=self.test_model,
-            input=self.test_text
-        )
+        response = cached_embed(self.client, self.test_model, self.test_text)
         
         # Validate response structure
         validate_embedding_response(response, expected_count=1)
@@ -74,38 +77,29 @@ class TestEmbeddings:
         
         # Should have 'embedding' field (singular) for old format
         assert "embedding" in response, "Response should contain 'embedding' field"
-        embedding = response["embedding"]
         
-        assert isinstance(embedding, list), "Embedding should be a list"
-        assert len(embedding) > 0, "Embedding should not be empty"
-        assert all(isinstance(x, (int, float)) for x in embedding), \
-            "Embedding should contain only numbers"
+        validate_embedding_response(response)
         
         logger.info("Deprecated embeddings() method still works")
     
-    def test_embedding_dimensions(self):
+    @pytest.mark.parametrize("model", TEST_EMBEDDING_MODELS)
+    def test_embedding_dimensions(self, model):
         """Verify embedding dimensions match expected model output."""
-        for model in TEST_EMBEDDING_MODELS:
-            if model not in EXPECTED_DIMENSIONS:
-                logger.warning(f"No expected dimensions for model {model}, skipping")
-                continue
-            
-            try:
-                response = self.client.embed(
-                    model=model,
-                    input=self.test_text
-                )
-                
-                embedding = extract_embedding(response)
-                expected_dim = EXPECTED_DIMENSIONS[model]
-                
-                assert len(embedding) == expected_dim, \
-                    f"Model {model}: expected {expected_dim} dimensions, got {len(embedding)}"
-                
-                logger.info(f"Model {model} produces correct {expected_dim} dimensions")
-                
-            except Exception as e:
-                logger.warning(f"Model {model} not available: {e}")
+        if model not in EXPECTED_DIMENSIONS:
+            pytest.skip(f"No expected dimensions for model {model}")
+        
+        try:
+            response = cached_embed(self.client, model, self.test_text)
+        except Exception as e:
+            pytest.skip(f"Model {model} not available: {e}")
+        
+        embedding = extract_embedding(response)
+        expected_dim = EXPECTED_DIMENSIONS[model]
+        
+        assert len(embedding) == expected_dim, \
+            f"Model {model}: expected {expected_dim} dimensions, got {len(embedding)}"
+        
+        logger.info(f"Model {model} produces correct {expected_dim} dimensions")
     
     # ===== Batch Embedding Tests =====
     
@@ -121,11 +115,15 @@ class TestEmbeddings:
         # Validate response
         validate_embedding_response(response, expected_count=len(texts))
         
-        # Check all embeddings have same dimension
-        embeddings = response["embeddings"]
-        dimensions = [len(emb) for emb in embeddings]
-        assert len(set(dimensions)) == 1, \
-            f"All embeddings should have same dimension, got {dimensions}"
+        # Stacking into one 2D matrix rejects a ragged batch, so all
+        # embeddings share a dimension; check it if the model's is known
+        embeddings = extract_embeddings_matrix(response)
+        assert embeddings.shape[0] == len(texts), \
+            f"Expected {len(texts)} embeddings, got {embeddings.shape[0]}"
+        if self.test_model in EXPECTED_DIMENSIONS:
+            expected_dim = EXPECTED_DIMENSIONS[self.test_model]
+            assert embeddings.shape[1] == expected_dim, \
+                f"Expected {expected_dim} dimensions, got {embeddings.shape[1]}"
         
         # Verify different texts produce different embeddings
         assert_embeddings_different(
@@ -137,9 +135,7 @@ class TestEmbeddings:
     
     def test_embed_large_batch(self):
         """Test embedding with 100+ strings."""
-        # Generate 100 unique texts
-        large_batch = [f"Test text number {i}: {text}" 
-                      for i, text in enumerate(SAMPLE_TEXTS * 20)]
+        large_batch = list(LARGE_BATCH_TEXTS)
         
         response = self.client.embed(
             model=self.test_model,
@@ -164,11 +160,8 @@ class TestEmbeddings:
     
     def test_embed_input_types(self):
         """Test string vs list[string] inputs."""
-        # Single string input
-        response_single = self.client.embed(
-            model=self.test_model,
-            input=self.test_text
-        )
+        # Single string input (usually already cached by an earlier test)
+        response_single = cached_embed(self.client, self.test_model, self.test_text)
         
         # List with single string
         response_list = self.client.embed(
@@ -186,21 +179,18 @@ class TestEmbeddings:
             message="Same text should produce same embedding regardless of input format"
         )
     
-    def test_embed_unicode(self):
+    @pytest.mark.parametrize("unicode_text", UNICODE_TEST_TEXTS)
+    def test_embed_unicode(self, unicode_text):
         """Test embedding with Unicode and special characters."""
-        for unicode_text in UNICODE_TEST_TEXTS:
-            response = self.client.embed(
-                model=self.test_model,
-                input=unicode_text
-            )
-            
-            validate_embedding_response(response)
-            embedding = extract_embedding(response)
-            
-            assert len(embedding) > 0, \
-                f"Unicode text '{unicode_text}' should produce valid embedding"
-            
-            logger.info(f"Successfully embedded Unicode text: {unicode_text[:20]}...")
+        response = cached_embed(self.client, self.test_model, unicode_text)
+        
+        validate_embedding_response(response)
+        embedding = extract_embedding(response)
+        
+        assert len(embedding) > 0, \
+            f"Unicode text '{unicode_text}' should produce valid embedding"
+        
+        logger.info(f"Successfully embedded Unicode text: {unicode_text[:20]}...")
     
     def test_embed_long_input(self):
         """Test embedding with very long text (>8k tokens)."""
@@ -229,18 +219,19 @@ class TestEmbeddings:
         validate_embedding_response(response_truncate)
         logger.info("Truncate parameter accepted")
     
-    def test_embed_keep_alive(self):
+    @pytest.mark.parametrize("keep_alive", ["5m", 300, "1h"])
+    def test_embed_keep_alive(self, keep_alive):
         """Test the keep_alive parameter."""
-        # Test with different keep_alive values
-        for keep_alive in ["5m", 300, "1h"]:
-            response = self.client.embed(
-                model=self.test_model,
-                input=self.test_text,
-                keep_alive=keep_alive
-            )
-            
-            validate_embedding_response(response)
-            logger.info(f"keep_alive={keep_alive} accepted")
+        # keep_alive only affects how long the model stays loaded, so the
+        # shortest input is enough to check that it is accepted
+        response = self.client.embed(
+            model=self.test_model,
+            input="x",
+            keep_alive=keep_alive
+        )
+        
+        validate_embedding_response(response)
+        logger.info(f"keep_alive={keep_alive} accepted")
     
     def test_embed_options(self):
         """Test passing custom options to embeddings."""
@@ -258,16 +249,16 @@ class TestEmbeddings:
     
     # ===== Error Handling Tests =====
     
-    def test_embed_invalid_model(self):
+    @pytest.mark.parametrize("invalid_model", INVALID_MODELS)
+    def test_embed_invalid_model(self, invalid_model):
         """Test error handling for non-existent embedding models."""
-        for invalid_model in INVALID_MODELS:
-            with pytest.raises(Exception) as exc_info:
-                self.client.embed(
-                    model=invalid_model,
-                    input=self.test_text
-                )
-            
-            logger.info(f"Invalid model '{invalid_model}' correctly raised: {exc_info.value}")
+        with pytest.raises(Exception) as exc_info:
+            self.client.embed(
+                model=invalid_model,
+                input=self.test_text
+            )
+        
+        logger.info(f"Invalid model '{invalid_model}' correctly raised: {exc_info.value}")
     
     def test_embed_empty_input(self):
         """Test error handling for empty or null inputs."""
@@ -295,10 +286,7 @@ class TestEmbeddings:
     
     def test_embed_response_format(self):
         """Verify the response matches Ollama's expected format."""
-        response = self.client.embed(
-            model=self.test_model,
-            input=self.test_text
-        )
+        response = cached_embed(self.client, self.test_model, self.test_text)
         
         # Check response has embeddings field (handle both dict and object responses)
         if hasattr(response, 'embeddings'):
@@ -319,24 +307,13 @@ class TestEmbeddings:
     
     def test_embed_array_structure(self):
         """Verify embeddings are returned as proper float arrays."""
-        response = self.client.embed(
-            model=self.test_model,
-            input=self.test_text
-        )
+        response = cached_embed(self.client, self.test_model, self.test_text)
         
-        embedding = extract_embedding(response)
+        # Check the SDK returns it as a list
+        assert isinstance(response["embeddings"][0], list), "Embedding should be a list"
         
-        # Check it's a list
-        assert isinstance(embedding, list), "Embedding should be a list"
-        
-        # Check all values are floats or ints
-        assert all(isinstance(x, (int, float)) for x in embedding), \
-            "All embedding values should be numeric"
-        
-        # Check values are in reasonable range (typically normalized)
-        embedding_array = np.array(embedding)
-        assert np.all(np.isfinite(embedding_array)), \
-            "Embedding should not contain inf or nan values"
+        # Checks the values are finite numbers in one vectorized pass
+        embedding_array = validate_embedding_response(response)[0]
         
         # Most embeddings are normalized, so magnitude should be reasonable
         magnitude = np.linalg.norm(embedding_array)
@@ -349,15 +326,12 @@ class TestEmbeddings:
     
     def test_embed_performance(self):
         """Benchmark embedding generation speed."""
-        # Warm-up request
-        self.client.embed(model=self.test_model, input=self.test_text)
+        # Warm-up request (skipped if an earlier test already embedded this text)
+        cached_embed(self.client, self.test_model, self.test_text)
         
         # Measure single embedding time
         response, elapsed_time = measure_response_time(
-            lambda: self.client.embed(
-                model=self.test_model,
-                input=self.test_text
-            )
+            lambda: self.client.embed(model=self.test_model, input=self.test_text)
         )
         
         validate_embedding_response(response)
@@ -370,10 +344,7 @@ class TestEmbeddings:
         # Measure batch embedding time
         batch_texts = SAMPLE_TEXTS[:5]
         batch_response, batch_time = measure_response_time(
-            lambda: self.client.embed(
-                model=self.test_model,
-                input=batch_texts
-            )
+            lambda: self.client.embed(model=self.test_model, input=batch_texts)
         )
         
         validate_embedding_response(batch_response, expected_count=len(batch_texts))
@@ -399,28 +370,33 @@ class TestEmbeddings:
         
         different_text = "Python is a programming language"
         
-        # Get embeddings
-        responses = [
-            self.client.embed(model=self.test_model, input=text)
-            for text in similar_texts + [different_text]
-        ]
+        # Get all embeddings in one batched request
+        response = self.client.embed(
+            model=self.test_model,
+            input=similar_texts + [different_text]
+        )
+        
+        embeddings = response["embeddings"]
+        count = len(similar_texts)
         
-        embeddings = [extract_embedding(resp) for resp in responses]
+        # Every pair involves at least one similar text, so the different
+        # text's own row of the symmetric matrix is never needed
+        similarities = cosine_similarity_matrix(embeddings, rows=count)
         
-        # Similar texts should have high similarity
-        for i in range(len(similar_texts)):
-            for j in range(i + 1, len(similar_texts)):
-                similarity = calculate_cosine_similarity(embeddings[i], embeddings[j])
-                assert similarity > 0.7, \
-                    f"Similar texts should have similarity > 0.7, got {similarity:.3f}"
-                logger.info(f"Similarity between text {i} and {j}: {similarity:.3f}")
+        # Similar texts should have high similarity (each pair once)
+        similar_pairs = similarities[:, :count][np.triu_indices(count, k=1)]
+        assert (similar_pairs > 0.7).all(), \
+            f"Similar texts should have similarity > 0.7, got {np.round(similar_pairs, 3)}"
         
         # Different text should have lower similarity
-        for i in range(len(similar_texts)):
-            similarity = calculate_cosine_similarity(embeddings[i], embeddings[-1])
-            assert similarity < 0.8, \
-                f"Different texts should have similarity < 0.8, got {similarity:.3f}"
-            logger.info(f"Similarity between text {i} and different text: {similarity:.3f}")
+        different_pairs = similarities[:, count]
+        assert (different_pairs < 0.8).all(), \
+            f"Different texts should have similarity < 0.8, got {np.round(different_pairs, 3)}"
+        
+        logger.info(
+            f"Similar pair similarities: {np.round(similar_pairs, 3)}, "
+            f"against different text: {np.round(different_pairs, 3)}"
+        )
     
     def test_embed_deterministic(self):
         """Test that same input produces same embedding (deterministic)."""
@@ -470,25 +446,80 @@ class TestEmbeddingsAsync:
         validate_embedding_response(response)
         logger.info("Async embedding successful")
     
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_embedding_dimensions_async(self, async_client):
+        """Check every model's dimensions with the requests in flight together."""
+        models = [model for model in TEST_EMBEDDING_MODELS if model in EXPECTED_DIMENSIONS]
+        
+        # Model loading and inference for each model overlap instead of
+        # running one after another
+        results = await asyncio.gather(
+            *(async_client.embed(model=model, input=SAMPLE_TEXTS[0]) for model in models),
+            return_exceptions=True
+        )
+        
+        checked = 0
+        for model, result in zip(models, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Model {model} not available: {result}")
+                continue
+            
+            embedding = extract_embedding(result)
+            expected_dim = EXPECTED_DIMENSIONS[model]
+            assert len(embedding) == expected_dim, \
+                f"Model {model}: expected {expected_dim} dimensions, got {len(embedding)}"
+            checked += 1
+        
+        if not checked:
+            pytest.skip("None of the embedding models are available")
+        
+        logger.info(f"Checked dimensions of {checked} models concurrently")
+    
     @pytest.mark.asyncio
     async def test_embed_async_batch(self, async_client):
         """Test async batch embedding processing."""
-        import asyncio
+        texts = SAMPLE_TEXTS[:5]
         
-        # Create multiple embedding tasks
-        tasks = [
-            async_client.embed(
-                model=DEFAULT_EMBEDDING_MODEL,
-                input=text
-            )
-            for text in SAMPLE_TEXTS[:5]
-        ]
+        # One batched request instead of one request per text
+        response = await async_client.embed(
+            model=DEFAULT_EMBEDDING_MODEL,
+            input=texts
+        )
         
-        # Run concurrently
-        responses = await asyncio.gather(*tasks)
+        validate_embedding_response(response, expected_count=len(texts))
         
-        # Validate all responses
-        for i, response in enumerate(responses):
-            validate_embedding_response(response)
+        logger.info(f"Async batch of {len(response['embeddings'])} embeddings successful")
+    
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_embed_large_batch_async(self, async_client):
+        """Test a 100-text batch split into concurrent sub-batches."""
+        large_batch = list(LARGE_BATCH_TEXTS)
         
-        logger.info(f"Async batch of {len(responses)} embeddings successful")
\ No newline at end of file
+        start_time = time.perf_counter()
+        single = await async_client.embed(
+            model=DEFAULT_EMBEDDING_MODEL,
+            input=large_batch
+        )
+        single_time = time.perf_counter() - start_time
+        
+        start_time = time.perf_counter()
+        embeddings = await embed_chunked(
+            async_client, DEFAULT_EMBEDDING_MODEL, large_batch
+        )
+        chunked_time = time.perf_counter() - start_time
+        
+        validate_embedding_response(
+            {"embeddings": embeddings}, expected_count=len(large_batch)
+        )
+        assert_embeddings_similar(
+            embeddings[-1], single["embeddings"][-1],
+            threshold=0.999,
+            message="Chunked results should stay in input order"
+        )
+        
+        logger.info(
+            f"Embedded {len(large_batch)} texts in {single_time:.3f}s as one batch, "
+            f"{chunked_time:.3f}s as concurrent sub-batches"
+        )
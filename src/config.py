@@ -3,11 +3,12 @@ Configuration management for the Ollama to OpenAI proxy service.
 """
 
 import json
+from functools import cache
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 from pydantic import Field, HttpUrl, field_validator, model_validator
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -44,6 +45,42 @@ class Settings(BaseSettings):
         ge=0,
         le=10,
     )
+    HTTPX_MAX_CONNECTIONS: int = Field(
+        default=1000,
+        description="Maximum concurrent connections to the OpenAI-compatible server",
+        ge=1,
+    )
+    HTTPX_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=256,
+        description="Maximum idle keep-alive connections kept in the pool",
+        ge=0,
+    )
+    HTTPX_KEEPALIVE_EXPIRY: float = Field(
+        default=75.0,
+        description=(
+            "Seconds an idle pooled connection is kept open "
+            "(matches the common 75s server keep-alive timeout)"
+        ),
+        ge=0,
+    )
+    RESPONSE_CACHE_SIZE: int = Field(
+        default=0,
+        description=(
+            "Maximum non-streaming chat responses kept in the exact-match "
+            "cache (0, the default, disables it)"
+        ),
+        ge=0,
+    )
+    RESPONSE_CACHE_TTL: float = Field(
+        default=3600.0,
+        description="Seconds a cached chat response stays valid",
+        gt=0,
+    )
+    RESPONSE_CACHE_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024,
+        description="Maximum total size in bytes of the cached response bodies",
+        ge=1,
+    )
     MODEL_MAPPING_FILE: Optional[str] = Field(
         default=None, description="Path to optional model name mapping JSON file"
     )
@@ -174,41 +211,38 @@ class Settings(BaseSettings):
         mappings = self.load_model_mappings()
         return mappings.get(ollama_model, ollama_model)
 
-    model_config = {
-        "env_file": ".env",
-        "case_sensitive": True,
-        "extra": "ignore",
-        "arbitrary_types_allowed": True,
-    }
-
-
-# Global settings instance (singleton)
-_settings: Optional[Settings] = None
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        extra="ignore",
+        arbitrary_types_allowed=True,
+    )
 
 
+@cache
 def get_settings() -> Settings:
     """
     Get the global settings instance (singleton pattern).
 
+    The instance is created on first call and memoized with functools.cache.
+
     Returns:
         Settings: The global settings instance
     """
-    global _settings
-    if _settings is None:
-        _settings = Settings()  # type: ignore[call-arg]
-        # Log SSL verification setting on startup
-        import logging
-
-        logger = logging.getLogger(__name__)
-        logger.info(
-            f"SSL verification disabled: {_settings.DISABLE_SSL_VERIFICATION}",
-            extra={
-                "extra_data": {
-                    "disable_ssl_verification": _settings.DISABLE_SSL_VERIFICATION
-                }
-            },
-        )
-    return _settings
+    settings = Settings()  # type: ignore[call-arg]
+    # Log SSL verification setting on startup
+    import logging
+
+    logger = logging.getLogger(__name__)
+    logger.info(
+        f"SSL verification disabled: {settings.DISABLE_SSL_VERIFICATION}",
+        extra={
+            "extra_data": {
+                "disable_ssl_verification": settings.DISABLE_SSL_VERIFICATION
+            }
+        },
+    )
+    return settings
 
 
 def reset_settings() -> None:
@@ -216,5 +250,4 @@ def reset_settings() -> None:
     Reset the global settings instance.
     Useful for testing or reloading configuration.
     """
-    global _settings
-    _settings = None
+    get_settings.cache_clear()
@@ -3,14 +3,13 @@ Main entry point for the Ollama to OpenAI proxy service.
 """
 
 import os
-import uuid
 from contextlib import asynccontextmanager
 from typing import Any, Dict
 
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from src._version import get_version, get_version_info
 from src.config import get_settings
@@ -18,7 +17,7 @@ from src.middleware.logging_middleware import LoggingMiddleware
 from src.middleware.metrics_middleware import MetricsMiddleware
 from src.routers import chat, embeddings, metrics, models, version
 from src.utils.exceptions import ProxyException, UpstreamError
-from src.utils.http_client import close_global_client
+from src.utils.http_client import close_global_client, get_retry_client
 from src.utils.logging import get_logger, setup_logging
 
 # Initialize settings and logging
@@ -78,6 +77,16 @@ async def lifespan(app: FastAPI):
         },
     )
 
+    # Create the shared upstream client before the first request arrives so
+    # its connection pool is ready; handlers reach the same instance through
+    # retry_client_context()
+    await get_retry_client()
+
+    # Pydantic models build their validators at class definition, so the
+    # remaining first-request cost is the chat translator, which loads the
+    # model mappings. Build it now rather than on the first chat request.
+    chat.get_translator()
+
     yield
 
     # Shutdown
@@ -93,6 +102,7 @@ app = FastAPI(
     description="Proxy service to translate Ollama API calls to OpenAI format",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
 )
@@ -108,11 +118,48 @@ app.add_middleware(
 )
 
 
+class RequestIdPool:
+    """
+    Hands out random 128-bit request IDs as 32-character hex strings.
+
+    Randomness is read from os.urandom in 4 KiB blocks and sliced 16 bytes
+    at a time, so one syscall covers 256 IDs. Only used from the event loop,
+    so no locking is needed.
+    """
+
+    BLOCK_SIZE = 4096
+    ID_BYTES = 16
+
+    def __init__(self) -> None:
+        self._buffer = b""
+        self._offset = 0
+
+    def reset(self) -> None:
+        """Discard buffered randomness (a forked child must not reuse it)."""
+        self._buffer = b""
+        self._offset = 0
+
+    def next_hex(self) -> str:
+        """Return the next request ID."""
+        offset = self._offset
+        if offset >= len(self._buffer):
+            self._buffer = os.urandom(self.BLOCK_SIZE)
+            offset = 0
+        self._offset = offset + self.ID_BYTES
+        return self._buffer[offset : offset + self.ID_BYTES].hex()
+
+
+_request_ids = RequestIdPool()
+if hasattr(os, "register_at_fork"):  # Not available on Windows
+    os.register_at_fork(after_in_child=_request_ids.reset)
+
+
 # Add request ID middleware
 @app.middleware("http")
 async def add_request_id_middleware(request: Request, call_next):
     """Add unique request ID to each request."""
-    request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+    # Only generate an ID when the client did not send one
+    request_id = request.headers.get("X-Request-ID") or _request_ids.next_hex()
     request.state.request_id = request_id
 
     response = await call_next(request)
@@ -5,13 +5,16 @@ This module handles both Ollama-style (/api) and OpenAI-style (/v1) endpoints
 for chat completions and text generation.
 """
 
-import json
-from collections.abc import AsyncGenerator
-from typing import Union
+import hashlib
+import logging
+from collections.abc import AsyncGenerator, AsyncIterator
+from functools import cache
+from typing import Optional, Union
 
 import httpx
+import orjson
 from fastapi import APIRouter, HTTPException, Request, status
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 
 from src.config import get_settings
 from src.models import (
@@ -29,47 +32,110 @@ from src.utils.exceptions import (
 from src.utils.http_client import RetryClient, retry_client_context
 from src.utils.logging import get_logger
 from src.utils.request_body import get_body_json
+from src.utils.response_cache import ResponseCache
 
 router = APIRouter()
 logger = get_logger(__name__)
 settings = get_settings()
 
-# Initialize translator
-translator = ChatTranslator()
+# Settings are fixed for the life of the process, so the values used per
+# request are read (and the upstream URL and headers built) once at import
+_REQUEST_TIMEOUT = settings.REQUEST_TIMEOUT
+_CHAT_COMPLETIONS_URL = f"{settings.OPENAI_API_BASE_URL}/chat/completions"
+_OPENAI_HEADERS = {
+    "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
+    "Content-Type": "application/json",
+}
+
+# Keep reverse proxies (nginx honours X-Accel-Buffering) and compression
+# layers from coalescing streamed chunks, so each token is flushed as sent
+_STREAMING_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+    "Content-Encoding": "identity",
+}
+
+# Translated Ollama bodies of reproducible non-streaming requests, keyed by
+# response_cache_key. Off unless RESPONSE_CACHE_SIZE is set.
+_response_cache = ResponseCache(
+    settings.RESPONSE_CACHE_SIZE,
+    settings.RESPONSE_CACHE_TTL,
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+)
+
+
+@cache
+def get_translator() -> ChatTranslator:
+    """
+    Return the shared chat translator, creating it on first use.
+
+    Building the translator loads the model mappings, so it is deferred
+    until the first chat or generate request instead of running at import.
+    """
+    return ChatTranslator()
+
+
+def response_cache_key(
+    endpoint: str, model: str, openai_request: OpenAIChatRequest
+) -> Optional[bytes]:
+    """
+    Build the response cache key for a non-streaming request.
+
+    Args:
+        endpoint: The Ollama endpoint name, since generate and chat translate
+            the same upstream response into different shapes
+        model: The model name the client asked for, which the response echoes
+        openai_request: The translated request sent upstream
+
+    Returns:
+        The key, or None if the cache is disabled or the request samples
+        without a seed and so has no single reproducible answer
+    """
+    if not _response_cache.enabled:
+        return None
+    if openai_request.seed is None and openai_request.temperature != 0:
+        return None
+
+    digest = hashlib.blake2b(f"{endpoint}\0{model}\0".encode(), digest_size=16)
+    digest.update(openai_request.model_dump_json(exclude_none=True).encode())
+    return digest.digest()
 
 
 async def make_openai_request(
     client: RetryClient,
     openai_request: OpenAIChatRequest,
-    stream: bool = False,
-) -> Union[httpx.Response, httpx.Response]:
-    """Make a request to the OpenAI-compatible backend."""
-    headers = {
-        "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
-        "Content-Type": "application/json",
-    }
-
-    url = f"{settings.OPENAI_API_BASE_URL}/chat/completions"
-
-    logger.debug(
-        "Making request to OpenAI backend",
-        extra={
-            "extra_data": {
-                "url": url,
-                "model": openai_request.model,
-                "stream": stream,
-                "message_count": len(openai_request.messages),
-            }
-        },
-    )
+) -> httpx.Response:
+    """
+    Make a non-streaming request to the OpenAI-compatible backend.
+
+    Streaming requests go through ``stream_response`` instead, so this path
+    has no stream branch.
+
+    The request is serialized to JSON bytes once by pydantic-core, before
+    the retry loop, rather than dumped to a dict and re-encoded by httpx.
+    """
+    body = openai_request.model_dump_json(exclude_none=True).encode()
+
+    # The extra payload is built only when the record would be emitted
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Making request to OpenAI backend",
+            extra={
+                "extra_data": {
+                    "url": _CHAT_COMPLETIONS_URL,
+                    "model": openai_request.model,
+                    "stream": openai_request.stream,
+                    "message_count": len(openai_request.messages),
+                }
+            },
+        )
 
     try:
-        # Use retry client for both streaming and non-streaming
         response = await client.request_with_retry(
             "POST",
-            url,
-            json=openai_request.model_dump(exclude_none=True),
-            headers=headers,
+            _CHAT_COMPLETIONS_URL,
+            content=body,
+            headers=_OPENAI_HEADERS,
         )
 
         if response.status_code != 200:
@@ -98,7 +164,7 @@ async def make_openai_request(
             "Request timeout",
             status_code=status.HTTP_504_GATEWAY_TIMEOUT,
             service="openai",
-            details={"timeout": settings.REQUEST_TIMEOUT},
+            details={"timeout": _REQUEST_TIMEOUT},
         )
     except httpx.NetworkError as e:
         logger.error(f"HTTP request error: {e}")
@@ -109,63 +175,85 @@ async def make_openai_request(
         )
 
 
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncGenerator[bytes, None]:
+    """
+    Split a raw byte stream into complete lines.
+
+    Network chunks do not respect line boundaries, so bytes after the last
+    newline are buffered until the rest of the line arrives. A final line
+    without a trailing newline is yielded when the stream ends.
+    """
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer.extend(chunk)
+        start = 0
+        while (newline := buffer.find(b"\n", start)) != -1:
+            yield bytes(buffer[start:newline])
+            start = newline + 1
+        # Drop consumed lines in one step instead of once per line
+        del buffer[:start]
+
+    if buffer:
+        yield bytes(buffer)
+
+
 async def stream_response(
     client: RetryClient,
     openai_request: OpenAIChatRequest,
     original_request: Union[OllamaGenerateRequest, OllamaChatRequest],
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """Stream responses from OpenAI and translate them to Ollama format."""
-    headers = {
-        "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
-        "Content-Type": "application/json",
-    }
-
-    url = f"{settings.OPENAI_API_BASE_URL}/chat/completions"
-
+    # Bound once so the per-token loop skips the attribute lookup
+    translate_chunk = get_translator().translate_streaming_response
     try:
         # Use stream_with_retry for streaming requests
-        async for chunk in client.stream_with_retry(
+        chunks = client.stream_with_retry(
             "POST",
-            url,
-            json=openai_request.model_dump(exclude_none=True),
-            headers=headers,
-        ):
-            # Process each chunk
-            chunk_str = chunk.decode("utf-8")
-            for line in chunk_str.split("\n"):
-                if not line.strip():
-                    continue
+            _CHAT_COMPLETIONS_URL,
+            content=openai_request.model_dump_json(exclude_none=True).encode(),
+            headers=_OPENAI_HEADERS,
+        )
+        # Lines stay bytes: orjson parses the payload slice directly, so
+        # nothing is decoded to str on the per-token path
+        async for line in iter_lines(chunks):
+            if not line:
+                continue
+
+            if line == b"data: [DONE]":
+                # Send final chunk
+                final_chunk = translate_chunk(
+                    "[DONE]",  # type: ignore
+                    original_request,
+                    is_last_chunk=True,
+                )
+                if final_chunk:
+                    yield orjson.dumps(final_chunk, option=orjson.OPT_APPEND_NEWLINE)
+                return
 
-                if line == "data: [DONE]":
-                    # Send final chunk
-                    final_chunk = translator.translate_streaming_response(
-                        "[DONE]",  # type: ignore
-                        original_request,
-                        is_last_chunk=True,
-                    )
-                    if final_chunk:
-                        yield json.dumps(final_chunk) + "\n"
-                    return
-
-                if line.startswith("data: "):
-                    try:
-                        # Parse the JSON data
-                        data = json.loads(line[6:])
-
-                        # Translate to Ollama format
-                        ollama_chunk = translator.translate_streaming_response(
-                            data, original_request
-                        )
+            if line.startswith(b"data: "):
+                try:
+                    # Parse the JSON data
+                    data = orjson.loads(line[6:])
 
-                        if ollama_chunk:
-                            yield json.dumps(ollama_chunk) + "\n"
+                    # Translate to Ollama format
+                    ollama_chunk = translate_chunk(data, original_request)
 
-                    except json.JSONDecodeError as e:
-                        logger.warning(
-                            "Failed to parse streaming chunk",
-                            extra={"extra_data": {"line": line, "error": str(e)}},
+                    if ollama_chunk:
+                        yield orjson.dumps(
+                            ollama_chunk, option=orjson.OPT_APPEND_NEWLINE
                         )
-                        continue
+
+                except orjson.JSONDecodeError as e:
+                    logger.warning(
+                        "Failed to parse streaming chunk",
+                        extra={
+                            "extra_data": {
+                                "line": line.decode("utf-8", "replace"),
+                                "error": str(e),
+                            }
+                        },
+                    )
+                    continue
 
     except httpx.TimeoutException:
         logger.error("Request timeout while streaming")
@@ -173,7 +261,7 @@ async def stream_response(
             "Request timeout",
             status_code=status.HTTP_504_GATEWAY_TIMEOUT,
             service="openai",
-            details={"timeout": settings.REQUEST_TIMEOUT},
+            details={"timeout": _REQUEST_TIMEOUT},
         )
     except httpx.NetworkError as e:
         logger.error(f"HTTP request error: {e}")
@@ -198,17 +286,18 @@ async def openai_chat_completions(
     This endpoint accepts OpenAI-style chat requests and forwards them
     directly to the OpenAI backend without translation.
     """
-    request_id = getattr(fastapi_request.state, "request_id", "unknown")
-
-    logger.debug(
-        "OpenAI endpoint handler started",
-        extra={
-            "extra_data": {
-                "request_id": request_id,
-                "path": fastapi_request.url.path,
-            }
-        },
-    )
+    request_id = fastapi_request.state.request_id
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "OpenAI endpoint handler started",
+            extra={
+                "extra_data": {
+                    "request_id": request_id,
+                    "path": fastapi_request.url.path,
+                }
+            },
+        )
 
     # Get request body using the utility function
     try:
@@ -222,45 +311,36 @@ async def openai_chat_completions(
             detail=f"Invalid request body: {str(e)}",
         )
 
-    logger.info(
-        "OpenAI chat completion request received",
-        extra={
-            "extra_data": {
-                "request_id": request_id,
-                "model": request.get("model", "unknown"),
-                "message_count": len(request.get("messages", [])),
-                "stream": request.get("stream", False),
-            }
-        },
-    )
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "OpenAI chat completion request received",
+            extra={
+                "extra_data": {
+                    "request_id": request_id,
+                    "model": request.get("model", "unknown"),
+                    "message_count": len(request.get("messages", [])),
+                    "stream": request.get("stream", False),
+                }
+            },
+        )
 
     try:
         async with retry_client_context() as client:
             # Forward request directly to OpenAI without Pydantic validation
-            headers = {
-                "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
-                "Content-Type": "application/json",
-            }
-
-            url = f"{settings.OPENAI_API_BASE_URL}/chat/completions"
-
             if request.get("stream", False):
                 # Handle streaming
                 return StreamingResponse(
                     openai_stream_response_dict(client, request),
                     media_type="text/plain",
-                    headers={
-                        "X-Request-ID": request_id,
-                        "Cache-Control": "no-cache",
-                    },
+                    headers={"X-Request-ID": request_id, **_STREAMING_HEADERS},
                 )
             else:
                 # Make non-streaming request
                 response = await client.request_with_retry(
                     "POST",
-                    url,
-                    json=request,
-                    headers=headers,
+                    _CHAT_COMPLETIONS_URL,
+                    content=orjson.dumps(request),
+                    headers=_OPENAI_HEADERS,
                 )
 
                 if response.status_code != 200:
@@ -281,9 +361,11 @@ async def openai_chat_completions(
                         details={"response": response.text[:500]},
                     )
 
-                # Return response directly
-                return JSONResponse(
-                    content=response.json(),
+                # Relay the upstream body as-is instead of parsing and
+                # re-encoding it
+                return Response(
+                    content=response.content,
+                    media_type="application/json",
                     headers={"X-Request-ID": request_id},
                 )
 
@@ -311,7 +393,7 @@ async def openai_completions(
     This endpoint accepts OpenAI-style requests for text completion
     and forwards them to the chat completions endpoint.
     """
-    request_id = getattr(fastapi_request.state, "request_id", "unknown")
+    request_id = fastapi_request.state.request_id
 
     # Get request body using the utility function
     try:
@@ -325,17 +407,18 @@ async def openai_completions(
             detail=f"Invalid request body: {str(e)}",
         )
 
-    logger.info(
-        "OpenAI text completion request received",
-        extra={
-            "extra_data": {
-                "request_id": request_id,
-                "model": request.get("model", "unknown"),
-                "message_count": len(request.get("messages", [])),
-                "stream": request.get("stream", False),
-            }
-        },
-    )
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "OpenAI text completion request received",
+            extra={
+                "extra_data": {
+                    "request_id": request_id,
+                    "model": request.get("model", "unknown"),
+                    "message_count": len(request.get("messages", [])),
+                    "stream": request.get("stream", False),
+                }
+            },
+        )
 
     # Forward to chat completions since OpenAI completions API is being phased out
     return await openai_chat_completions(fastapi_request)
@@ -352,7 +435,7 @@ async def generate(
     This endpoint accepts Ollama-style generation requests and translates them
     to OpenAI chat completion format for processing.
     """
-    request_id = getattr(fastapi_request.state, "request_id", "unknown")
+    request_id = fastapi_request.state.request_id
 
     # Get request body using the utility function
     try:
@@ -367,20 +450,22 @@ async def generate(
             detail=f"Invalid request body: {str(e)}",
         )
 
-    logger.info(
-        "Generate request received",
-        extra={
-            "extra_data": {
-                "request_id": request_id,
-                "model": request.model,
-                "prompt_length": len(request.prompt),
-                "stream": request.stream,
-            }
-        },
-    )
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Generate request received",
+            extra={
+                "extra_data": {
+                    "request_id": request_id,
+                    "model": request.model,
+                    "prompt_length": len(request.prompt),
+                    "stream": request.stream,
+                }
+            },
+        )
 
     try:
         # Translate to OpenAI format
+        translator = get_translator()
         openai_request = translator.translate_request(request)
 
         async with retry_client_context() as client:
@@ -389,28 +474,44 @@ async def generate(
                 return StreamingResponse(
                     stream_response(client, openai_request, request),
                     media_type="application/x-ndjson",
-                    headers={
-                        "X-Request-ID": request_id,
-                        "Cache-Control": "no-cache",
-                    },
+                    headers={"X-Request-ID": request_id, **_STREAMING_HEADERS},
                 )
             else:
-                # Make non-streaming request
-                response = await make_openai_request(
-                    client, openai_request, stream=False
+                cache_key = response_cache_key(
+                    "generate", request.model, openai_request
                 )
+                body = _response_cache.get(cache_key) if cache_key is not None else None
+                headers = {"X-Request-ID": request_id}
+                if cache_key is not None:
+                    # A hit replays the stored body, timestamps and durations
+                    # included, so let clients tell it apart
+                    headers["X-Cache"] = "MISS" if body is None else "HIT"
+
+                if body is None:
+                    # Make non-streaming request
+                    response = await make_openai_request(client, openai_request)
+
+                    # Validate the raw body straight into the model, without
+                    # building an intermediate dict first
+                    openai_response = OpenAIChatResponse.model_validate_json(
+                        response.content
+                    )
 
-                # Parse response
-                openai_response = OpenAIChatResponse(**response.json())
+                    # Translate response back to Ollama format
+                    ollama_response = translator.translate_response(
+                        openai_response, request
+                    )
 
-                # Translate response back to Ollama format
-                ollama_response = translator.translate_response(
-                    openai_response, request
-                )
+                    # Serialize straight to JSON with pydantic-core, skipping
+                    # the intermediate dict and the stdlib encoder
+                    body = ollama_response.model_dump_json(exclude_none=True).encode()
+                    if cache_key is not None:
+                        _response_cache.set(cache_key, body)
 
-                return JSONResponse(
-                    content=ollama_response.model_dump(exclude_none=True),
-                    headers={"X-Request-ID": request_id},
+                return Response(
+                    content=body,
+                    media_type="application/json",
+                    headers=headers,
                 )
 
     except ValidationError as e:
@@ -449,7 +550,7 @@ async def ollama_chat(
     This endpoint accepts Ollama-style chat requests with message history
     and processes them through the OpenAI backend.
     """
-    request_id = getattr(fastapi_request.state, "request_id", "unknown")
+    request_id = fastapi_request.state.request_id
 
     # Get request body using the utility function
     try:
@@ -464,20 +565,22 @@ async def ollama_chat(
             detail=f"Invalid request body: {str(e)}",
         )
 
-    logger.info(
-        "Chat request received",
-        extra={
-            "extra_data": {
-                "request_id": request_id,
-                "model": request.model,
-                "message_count": len(request.messages),
-                "stream": request.stream,
-            }
-        },
-    )
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Chat request received",
+            extra={
+                "extra_data": {
+                    "request_id": request_id,
+                    "model": request.model,
+                    "message_count": len(request.messages),
+                    "stream": request.stream,
+                }
+            },
+        )
 
     try:
         # Translate to OpenAI format
+        translator = get_translator()
         openai_request = translator.translate_request(request)
 
         async with retry_client_context() as client:
@@ -486,28 +589,42 @@ async def ollama_chat(
                 return StreamingResponse(
                     stream_response(client, openai_request, request),
                     media_type="application/x-ndjson",
-                    headers={
-                        "X-Request-ID": request_id,
-                        "Cache-Control": "no-cache",
-                    },
+                    headers={"X-Request-ID": request_id, **_STREAMING_HEADERS},
                 )
             else:
-                # Make non-streaming request
-                response = await make_openai_request(
-                    client, openai_request, stream=False
-                )
+                cache_key = response_cache_key("chat", request.model, openai_request)
+                body = _response_cache.get(cache_key) if cache_key is not None else None
+                headers = {"X-Request-ID": request_id}
+                if cache_key is not None:
+                    # A hit replays the stored body, timestamps and durations
+                    # included, so let clients tell it apart
+                    headers["X-Cache"] = "MISS" if body is None else "HIT"
+
+                if body is None:
+                    # Make non-streaming request
+                    response = await make_openai_request(client, openai_request)
+
+                    # Validate the raw body straight into the model, without
+                    # building an intermediate dict first
+                    openai_response = OpenAIChatResponse.model_validate_json(
+                        response.content
+                    )
 
-                # Parse response
-                openai_response = OpenAIChatResponse(**response.json())
+                    # Translate response back to Ollama format
+                    ollama_response = translator.translate_response(
+                        openai_response, request
+                    )
 
-                # Translate response back to Ollama format
-                ollama_response = translator.translate_response(
-                    openai_response, request
-                )
+                    # Serialize straight to JSON with pydantic-core, skipping
+                    # the intermediate dict and the stdlib encoder
+                    body = ollama_response.model_dump_json(exclude_none=True).encode()
+                    if cache_key is not None:
+                        _response_cache.set(cache_key, body)
 
-                return JSONResponse(
-                    content=ollama_response.model_dump(exclude_none=True),
-                    headers={"X-Request-ID": request_id},
+                return Response(
+                    content=body,
+                    media_type="application/json",
+                    headers=headers,
                 )
 
     except ValidationError as e:
@@ -539,25 +656,19 @@ async def ollama_chat(
 async def openai_stream_response(
     client: RetryClient,
     openai_request: OpenAIChatRequest,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """Stream responses from OpenAI in OpenAI format (no translation)."""
-    headers = {
-        "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
-        "Content-Type": "application/json",
-    }
-
-    url = f"{settings.OPENAI_API_BASE_URL}/chat/completions"
-
     try:
         # Use stream_with_retry for streaming requests
         async for chunk in client.stream_with_retry(
             "POST",
-            url,
-            json=openai_request.model_dump(exclude_none=True),
-            headers=headers,
+            _CHAT_COMPLETIONS_URL,
+            content=openai_request.model_dump_json(exclude_none=True).encode(),
+            headers=_OPENAI_HEADERS,
         ):
-            # Pass through chunks directly without translation
-            yield chunk.decode("utf-8")
+            # Pass raw bytes through untouched: no decode/re-encode, and a
+            # multi-byte character split across chunks stays intact
+            yield chunk
 
     except httpx.TimeoutException:
         logger.error("Request timeout while streaming")
@@ -565,7 +676,7 @@ async def openai_stream_response(
             "Request timeout",
             status_code=status.HTTP_504_GATEWAY_TIMEOUT,
             service="openai",
-            details={"timeout": settings.REQUEST_TIMEOUT},
+            details={"timeout": _REQUEST_TIMEOUT},
         )
     except httpx.NetworkError as e:
         logger.error(f"HTTP request error: {e}")
@@ -582,25 +693,19 @@ async def openai_stream_response(
 async def openai_stream_response_dict(
     client: RetryClient,
     request_dict: dict,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """Stream responses from OpenAI using dict request (no Pydantic validation)."""
-    headers = {
-        "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
-        "Content-Type": "application/json",
-    }
-
-    url = f"{settings.OPENAI_API_BASE_URL}/chat/completions"
-
     try:
         # Use stream_with_retry for streaming requests
         async for chunk in client.stream_with_retry(
             "POST",
-            url,
-            json=request_dict,  # Pass dict directly
-            headers=headers,
+            _CHAT_COMPLETIONS_URL,
+            content=orjson.dumps(request_dict),  # Pass dict directly
+            headers=_OPENAI_HEADERS,
         ):
-            # Pass through chunks directly without translation
-            yield chunk.decode("utf-8")
+            # Pass raw bytes through untouched: no decode/re-encode, and a
+            # multi-byte character split across chunks stays intact
+            yield chunk
 
     except httpx.TimeoutException:
         logger.error("Request timeout while streaming")
@@ -608,7 +713,7 @@ async def openai_stream_response_dict(
             "Request timeout",
             status_code=status.HTTP_504_GATEWAY_TIMEOUT,
             service="openai",
-            details={"timeout": settings.REQUEST_TIMEOUT},
+            details={"timeout": _REQUEST_TIMEOUT},
         )
     except httpx.NetworkError as e:
         logger.error(f"HTTP request error: {e}")
@@ -6,8 +6,9 @@ for text embeddings.
 """
 
 import httpx
+import orjson
 from fastapi import APIRouter, HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 
 from src.config import get_settings
 from src.models import (
@@ -67,7 +68,9 @@ async def make_openai_embedding_request(
         response = await client.request_with_retry(
             "POST",
             url,
-            json=openai_request.model_dump(exclude_none=True),
+            # pydantic-core writes the JSON body directly, without an
+            # intermediate dict re-encoded by httpx
+            content=openai_request.model_dump_json(exclude_none=True).encode(),
             headers=headers,
         )
 
@@ -113,7 +116,7 @@ async def make_openai_embedding_request(
 @router.post("/embeddings")
 async def embeddings_handler(
     fastapi_request: Request,
-) -> JSONResponse:
+) -> Response:
     """Route to the appropriate embeddings handler based on the path prefix."""
     path = fastapi_request.url.path
 
@@ -127,14 +130,14 @@ async def embeddings_handler(
 
 async def create_embeddings_openai_style(
     fastapi_request: Request,
-) -> JSONResponse:
+) -> Response:
     """
     Create embeddings using OpenAI-style format.
 
     This endpoint accepts OpenAI-style embedding requests and forwards them
     directly to the OpenAI backend without translation.
     """
-    request_id = getattr(fastapi_request.state, "request_id", "unknown")
+    request_id = fastapi_request.state.request_id
 
     # Get request body using the utility function
     try:
@@ -172,7 +175,7 @@ async def create_embeddings_openai_style(
             response = await client.request_with_retry(
                 "POST",
                 url,
-                json=request,
+                content=orjson.dumps(request),
                 headers=headers,
             )
 
@@ -194,9 +197,11 @@ async def create_embeddings_openai_style(
                     details={"response": response.text[:500]},
                 )
 
-            # Return response directly
-            return JSONResponse(
-                content=response.json(),
+            # Relay the upstream body as-is instead of parsing and
+            # re-encoding it
+            return Response(
+                content=response.content,
+                media_type="application/json",
                 headers={"X-Request-ID": request_id},
             )
 
@@ -215,14 +220,14 @@ async def create_embeddings_openai_style(
 
 async def create_embeddings_ollama_style(
     fastapi_request: Request,
-) -> JSONResponse:
+) -> Response:
     """
     Create embeddings for the given text input.
 
     Supports both single string and batch string inputs through Ollama format,
     translates to OpenAI embeddings API, and returns in Ollama format.
     """
-    request_id = getattr(fastapi_request.state, "request_id", "unknown")
+    request_id = fastapi_request.state.request_id
 
     # Get request body using the utility function
     try:
@@ -264,8 +269,9 @@ async def create_embeddings_ollama_style(
 
         # Parse OpenAI response
         try:
-            openai_response_data = response.json()
-            openai_response = OpenAIEmbeddingResponse(**openai_response_data)
+            openai_response = OpenAIEmbeddingResponse.model_validate_json(
+                response.content
+            )
         except Exception as e:
             logger.error(f"Failed to parse OpenAI embedding response: {e}")
             raise UpstreamError(
@@ -292,8 +298,9 @@ async def create_embeddings_ollama_style(
             },
         )
 
-        return JSONResponse(
-            content=ollama_response.model_dump(),
+        return Response(
+            content=ollama_response.model_dump_json(),
+            media_type="application/json",
             headers={"X-Request-ID": request_id},
         )
 
@@ -342,14 +349,14 @@ async def create_embeddings_ollama_style(
 @router.post("/embed")
 async def create_embed_ollama_style(
     fastapi_request: Request,
-) -> JSONResponse:
+) -> Response:
     """
     Create embeddings using the new Ollama embed endpoint format.
 
     This is the new endpoint that replaces /embeddings.
     It uses 'input' instead of 'prompt' field.
     """
-    request_id = getattr(fastapi_request.state, "request_id", "unknown")
+    request_id = fastapi_request.state.request_id
 
     # Get request body using the utility function
     try:
@@ -399,8 +406,9 @@ async def create_embed_ollama_style(
 
         # Parse OpenAI response
         try:
-            openai_response_data = response.json()
-            openai_response = OpenAIEmbeddingResponse(**openai_response_data)
+            openai_response = OpenAIEmbeddingResponse.model_validate_json(
+                response.content
+            )
         except Exception as e:
             logger.error(f"Failed to parse OpenAI embedding response: {e}")
             raise UpstreamError(
@@ -437,7 +445,7 @@ async def create_embed_ollama_style(
             },
         )
 
-        return JSONResponse(
+        return ORJSONResponse(
             content=response_data,
             headers={"X-Request-ID": request_id},
         )
@@ -11,7 +11,7 @@ from typing import List
 
 import httpx
 from fastapi import APIRouter, HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from src.config import get_settings
 from src.models import (
@@ -26,6 +26,7 @@ from src.models import (
     OpenAIModelsResponse,
 )
 from src.utils.exceptions import UpstreamError
+from src.utils.http_client import retry_client_context
 from src.utils.logging import get_logger
 
 router = APIRouter()
@@ -35,13 +36,13 @@ settings = get_settings()
 
 @router.get("/tags")
 @router.get("/models")  # OpenAI-style endpoint
-async def list_models(fastapi_request: Request) -> JSONResponse:
+async def list_models(fastapi_request: Request) -> Response:
     """
     List available models from the OpenAI-compatible backend.
 
     Translates OpenAI model format to Ollama format.
     """
-    request_id = getattr(fastapi_request.state, "request_id", "unknown")
+    request_id = fastapi_request.state.request_id
 
     logger.info(
         "Models list request received",
@@ -50,21 +51,12 @@ async def list_models(fastapi_request: Request) -> JSONResponse:
 
     try:
         # Query OpenAI-compatible backend for models
-        verify_ssl = not settings.DISABLE_SSL_VERIFICATION
-        logger.info(
-            f"Models router SSL verification: {verify_ssl}",
-            extra={
-                "extra_data": {
-                    "ssl_verification": verify_ssl,
-                    "disable_ssl_verification": settings.DISABLE_SSL_VERIFICATION,
-                }
-            },
-        )
-
-        async with httpx.AsyncClient(
-            timeout=settings.REQUEST_TIMEOUT, verify=verify_ssl
-        ) as client:
-            response = await client.get(
+        # Share the process-wide client (and its keep-alive pool) with the
+        # chat and embeddings routers instead of opening one per request.
+        # A single plain GET: no retries, and failures here must not count
+        # towards the circuit breaker that guards chat and embeddings.
+        async with retry_client_context() as client:
+            response = await client.client.get(
                 f"{settings.OPENAI_API_BASE_URL}/models",
                 headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
             )
@@ -117,8 +109,9 @@ async def list_models(fastapi_request: Request) -> JSONResponse:
                 ollama_models.append(ollama_model)
 
             models_response = OllamaModelsResponse(models=ollama_models)
-            return JSONResponse(
-                content=models_response.model_dump(),
+            return Response(
+                content=models_response.model_dump_json(),
+                media_type="application/json",
                 headers={"X-Request-ID": request_id},
             )
 
@@ -148,7 +141,7 @@ async def pull_model(
 
     This operation is not supported as models are managed by the backend.
     """
-    request_id = getattr(fastapi_request.state, "request_id", "unknown")
+    request_id = fastapi_request.state.request_id
 
     logger.warning(
         f"Unsupported pull request for model: {request.name}",
@@ -178,7 +171,7 @@ async def push_model(
 
     This operation is not supported as models are managed by the backend.
     """
-    request_id = getattr(fastapi_request.state, "request_id", "unknown")
+    request_id = fastapi_request.state.request_id
 
     logger.warning(
         f"Unsupported push request for model: {request.name}",
@@ -208,7 +201,7 @@ async def delete_model(
 
     This operation is not supported as models are managed by the backend.
     """
-    request_id = getattr(fastapi_request.state, "request_id", "unknown")
+    request_id = fastapi_request.state.request_id
 
     logger.warning(
         f"Unsupported delete request for model: {request.name}",
@@ -235,7 +228,7 @@ async def get_version(fastapi_request: Request) -> JSONResponse:
 
     Returns both the Ollama version we're emulating and proxy information.
     """
-    request_id = getattr(fastapi_request.state, "request_id", "unknown")
+    request_id = fastapi_request.state.request_id
 
     logger.info(
         "Version request received",
@@ -255,14 +248,14 @@ async def get_version(fastapi_request: Request) -> JSONResponse:
 async def show_model(
     request: OllamaShowRequest,
     fastapi_request: Request,
-) -> JSONResponse:
+) -> Response:
     """
     Show model information.
 
     Since OpenAI API doesn't provide detailed model information like Ollama,
     we return a basic response with default values.
     """
-    request_id = getattr(fastapi_request.state, "request_id", "unknown")
+    request_id = fastapi_request.state.request_id
 
     logger.info(
         f"Show model request for: {request.name}",
@@ -277,21 +270,12 @@ async def show_model(
 
     # First, verify the model exists by listing models
     try:
-        verify_ssl = not settings.DISABLE_SSL_VERIFICATION
-        logger.info(
-            f"Models router SSL verification: {verify_ssl}",
-            extra={
-                "extra_data": {
-                    "ssl_verification": verify_ssl,
-                    "disable_ssl_verification": settings.DISABLE_SSL_VERIFICATION,
-                }
-            },
-        )
-
-        async with httpx.AsyncClient(
-            timeout=settings.REQUEST_TIMEOUT, verify=verify_ssl
-        ) as client:
-            response = await client.get(
+        # Share the process-wide client (and its keep-alive pool) with the
+        # chat and embeddings routers instead of opening one per request.
+        # A single plain GET: no retries, and failures here must not count
+        # towards the circuit breaker that guards chat and embeddings.
+        async with retry_client_context() as client:
+            response = await client.client.get(
                 f"{settings.OPENAI_API_BASE_URL}/models",
                 headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
             )
@@ -367,7 +351,8 @@ num_predict 128"""
             else {}
         ),
     )
-    return JSONResponse(
-        content=show_response.model_dump(),
+    return Response(
+        content=show_response.model_dump_json(),
+        media_type="application/json",
         headers={"X-Request-ID": request_id},
     )
@@ -8,7 +8,7 @@ for all request/response translators.
 import uuid
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, Dict, Generic, Optional, TypeVar
+from typing import Any, Dict, Generic, Optional, Tuple, TypeVar
 
 from src.config import get_settings
 from src.models import OllamaOptions
@@ -38,6 +38,21 @@ class BaseTranslator(
     - Logging
     """
 
+    # Ollama option name -> OpenAI parameter name. top_k has no OpenAI
+    # equivalent and is dropped by extract_options.
+    OPTION_MAP: Tuple[Tuple[str, str], ...] = (
+        ("temperature", "temperature"),
+        ("top_p", "top_p"),
+        ("num_predict", "max_tokens"),
+        ("stop", "stop"),
+        ("seed", "seed"),
+        ("presence_penalty", "presence_penalty"),
+        ("frequency_penalty", "frequency_penalty"),
+    )
+    REVERSE_OPTION_MAP: Tuple[Tuple[str, str], ...] = tuple(
+        (openai_key, ollama_key) for ollama_key, openai_key in OPTION_MAP
+    )
+
     def __init__(self, model_mappings: Optional[Dict[str, str]] = None):
         """
         Initialize the base translator.
@@ -58,6 +73,20 @@ class BaseTranslator(
             f"Initialized {self.__class__.__name__} with {len(self.model_mappings)} model mappings"
         )
 
+    @property
+    def model_mappings(self) -> Dict[str, str]:
+        """Mapping of Ollama model names to OpenAI model names."""
+        return self._model_mappings
+
+    @model_mappings.setter
+    def model_mappings(self, mappings: Dict[str, str]) -> None:
+        self._model_mappings = mappings
+        # Model names are mapped on every request and reverse-mapped on every
+        # streamed chunk, so both lookups are bound once here instead of
+        # rebuilding the reverse table per call
+        self._map_model = mappings.get
+        self._reverse_map_model = {v: k for k, v in mappings.items()}.get
+
     @abstractmethod
     def translate_request(self, ollama_request: OllamaRequestType) -> OpenAIRequestType:
         """
@@ -129,7 +158,7 @@ class BaseTranslator(
         Returns:
             The mapped OpenAI model name, or the original if no mapping exists
         """
-        mapped = self.model_mappings.get(ollama_model, ollama_model)
+        mapped = self._map_model(ollama_model, ollama_model)
         if mapped != ollama_model:
             self.logger.debug(f"Mapped model '{ollama_model}' to '{mapped}'")
         return mapped
@@ -144,9 +173,7 @@ class BaseTranslator(
         Returns:
             The original Ollama model name, or the OpenAI name if no mapping exists
         """
-        # Create reverse mapping
-        reverse_mappings = {v: k for k, v in self.model_mappings.items()}
-        return reverse_mappings.get(openai_model, openai_model)
+        return self._reverse_map_model(openai_model, openai_model)
 
     def extract_options(
         self, ollama_options: Optional[OllamaOptions]
@@ -163,42 +190,24 @@ class BaseTranslator(
         if not ollama_options:
             return {}
 
-        # Convert to dict, excluding None values
-        options_dict = ollama_options.model_dump(exclude_none=True)
-
-        # Map Ollama options to OpenAI parameters
-        mapping = {
-            "temperature": "temperature",
-            "top_p": "top_p",
-            "top_k": "top_k",  # Note: OpenAI doesn't have top_k
-            "num_predict": "max_tokens",
-            "stop": "stop",
-            "seed": "seed",
-            "presence_penalty": "presence_penalty",
-            "frequency_penalty": "frequency_penalty",
-        }
-
+        # Read only the mapped fields instead of dumping every option
         result = {}
-        for ollama_key, openai_key in mapping.items():
-            if ollama_key in options_dict:
-                value = options_dict[ollama_key]
-
-                # Special handling for certain parameters
-                if ollama_key == "top_k" and openai_key == "top_k":
-                    # OpenAI doesn't support top_k, skip it
-                    self.logger.debug(
-                        f"Skipping unsupported parameter 'top_k': {value}"
-                    )
-                    continue
-                elif ollama_key == "num_predict" and value == 0:
-                    # Ollama num_predict=0 means unlimited, which should be None in OpenAI
-                    self.logger.debug(
-                        "Converting num_predict=0 (unlimited) to max_tokens=None"
-                    )
-                    continue  # Skip setting max_tokens, leaving it as None
-
+        for ollama_key, openai_key in self.OPTION_MAP:
+            value = getattr(ollama_options, ollama_key)
+            if value is not None:
                 result[openai_key] = value
 
+        if ollama_options.top_k is not None:
+            # OpenAI doesn't support top_k, skip it
+            self.logger.debug(
+                f"Skipping unsupported parameter 'top_k': {ollama_options.top_k}"
+            )
+
+        if result.get("max_tokens") == 0:
+            # Ollama num_predict=0 means unlimited, which should be None in OpenAI
+            self.logger.debug("Converting num_predict=0 (unlimited) to max_tokens=None")
+            del result["max_tokens"]
+
         return result
 
     def extract_ollama_options(self, openai_params: Dict[str, Any]) -> Dict[str, Any]:
@@ -211,24 +220,12 @@ class BaseTranslator(
         Returns:
             Dictionary of Ollama-compatible options
         """
-        # Reverse mapping
-        mapping = {
-            "temperature": "temperature",
-            "top_p": "top_p",
-            "max_tokens": "num_predict",
-            "stop": "stop",
-            "seed": "seed",
-            "presence_penalty": "presence_penalty",
-            "frequency_penalty": "frequency_penalty",
+        return {
+            ollama_key: openai_params[openai_key]
+            for openai_key, ollama_key in self.REVERSE_OPTION_MAP
+            if openai_key in openai_params
         }
 
-        result = {}
-        for openai_key, ollama_key in mapping.items():
-            if openai_key in openai_params:
-                result[ollama_key] = openai_params[openai_key]
-
-        return result
-
     def generate_message_id(self) -> str:
         """Generate a unique message ID."""
         return f"msg-{uuid.uuid4().hex[:8]}"
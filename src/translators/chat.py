@@ -5,9 +5,10 @@ This module handles the translation of chat completion requests and responses
 between Ollama and OpenAI formats for Phase 2 (including tool calling and image support).
 """
 
-import json
 from typing import Any, Dict, List, Optional, Union
 
+import orjson
+
 from src.models import (
     OllamaChatMessage,
     OllamaChatRequest,
@@ -192,8 +193,8 @@ class ChatTranslator(
 
                 # Parse JSON chunk
                 try:
-                    openai_chunk = json.loads(openai_chunk)
-                except json.JSONDecodeError:
+                    openai_chunk = orjson.loads(openai_chunk)
+                except orjson.JSONDecodeError:
                     self.logger.warning(
                         f"Failed to parse streaming chunk: {openai_chunk}"
                     )
@@ -106,9 +106,12 @@ class RetryClient:
         self.jitter = jitter
         self.circuit_breaker = circuit_breaker or CircuitBreaker()
 
-        # Configure connection pooling
+        # Configure connection pooling; sized for bursts of concurrent clients
+        # and kept alive as long as typical upstream servers keep idle sockets
         limits = httpx.Limits(
-            max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0
+            max_connections=settings.HTTPX_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTPX_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTPX_KEEPALIVE_EXPIRY,
         )
 
         # Configure timeouts
@@ -266,8 +269,10 @@ class RetryClient:
                     response.raise_for_status()
                     self.circuit_breaker.record_success()
 
-                    # Yield the response for streaming
-                    async for chunk in response.aiter_raw():
+                    # Yield decoded body bytes as they arrive; unlike
+                    # aiter_raw this undoes any gzip/deflate Content-Encoding
+                    # the upstream applied (httpx asks for it by default)
+                    async for chunk in response.aiter_bytes():
                         yield chunk
                     return
 
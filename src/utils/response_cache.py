@@ -0,0 +1,88 @@
+"""
+In-memory exact-match cache for non-streaming responses.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+
+class ResponseCache:
+    """
+    LRU cache of serialized response bodies with a per-entry TTL.
+
+    Entries are evicted least-recently-used first once either ``maxsize``
+    entries or ``max_bytes`` of stored bodies is exceeded, and treated as
+    missing once older than ``ttl`` seconds. A ``maxsize`` of 0 disables the
+    cache. Operations never await, so no lock is needed when the cache is only
+    touched from the event loop.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        max_bytes: Optional[int] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._timer = timer
+        self._entries: OrderedDict[bytes, Tuple[float, bytes]] = OrderedDict()
+        self._size = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything at all."""
+        return self.maxsize > 0
+
+    @property
+    def size(self) -> int:
+        """Total bytes of the cached bodies."""
+        return self._size
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        """Return the cached body for ``key``, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._timer():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: bytes, value: bytes) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entries if full."""
+        if not self.enabled:
+            return
+        if self.max_bytes is not None and len(value) > self.max_bytes:
+            # Would evict everything else and still not fit
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (self._timer() + self.ttl, value)
+        self._size += len(value)
+
+        while len(self._entries) > self.maxsize or (
+            self.max_bytes is not None and self._size > self.max_bytes
+        ):
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self._size = 0
+
+    def _remove(self, key: bytes) -> None:
+        _, value = self._entries.pop(key)
+        self._size -= len(value)
+
+    def __len__(self) -> int:
+        return len(self._entries)
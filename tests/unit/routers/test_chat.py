@@ -14,8 +14,10 @@ from src.models import (
     OllamaChatRequest,
     OllamaGenerateRequest,
     OllamaOptions,
+    OpenAIChatRequest,
 )
 from src.utils.exceptions import ValidationError
+from src.utils.response_cache import ResponseCache
 
 
 @pytest.fixture
@@ -32,10 +34,18 @@ def mock_settings():
 @pytest.fixture
 def mock_translator():
     """Mock translator for tests."""
-    with patch("src.routers.chat.translator") as mock:
+    with patch("src.routers.chat.get_translator") as mock_get_translator:
+        mock = mock_get_translator.return_value
         yield mock
 
 
+@pytest.fixture(autouse=True)
+def response_cache():
+    """Give each test a fresh response cache, disabled unless a test enables it."""
+    with patch("src.routers.chat._response_cache", ResponseCache(0, 60)) as cache:
+        yield cache
+
+
 @pytest.fixture
 def mock_request():
     """Mock FastAPI request with request ID."""
@@ -70,6 +80,15 @@ def ollama_chat_request():
     )
 
 
+@pytest.fixture
+def openai_chat_request():
+    """Sample translated OpenAI chat request."""
+    return OpenAIChatRequest(
+        model="gpt-3.5-turbo",
+        messages=[{"role": "user", "content": "Hello"}],
+    )
+
+
 @pytest.fixture
 def openai_response_data():
     """Sample OpenAI response data."""
@@ -107,18 +126,25 @@ class TestChatRouterGenerate:
         """Test successful non-streaming generate request."""
         # Setup mocks
         mock_openai_request = Mock()
-        mock_openai_request.model_dump.return_value = {"model": "gpt-3.5-turbo"}
+        mock_openai_request.model_dump_json.return_value = json.dumps(
+            {
+                "model": "gpt-3.5-turbo",
+                "messages": [{"role": "user", "content": "Hello"}],
+            }
+        )
         mock_openai_request.model = "gpt-3.5-turbo"
         mock_openai_request.messages = [{"role": "user", "content": "Hello"}]
 
         mock_translator.translate_request.return_value = mock_openai_request
 
         mock_ollama_response = Mock()
-        mock_ollama_response.model_dump.return_value = {
-            "model": "llama2",
-            "response": "I'm doing well, thank you!",
-            "done": True,
-        }
+        mock_ollama_response.model_dump_json.return_value = json.dumps(
+            {
+                "model": "llama2",
+                "response": "I'm doing well, thank you!",
+                "done": True,
+            }
+        )
         mock_translator.translate_response.return_value = mock_ollama_response
 
         # Mock HTTP client
@@ -129,7 +155,7 @@ class TestChatRouterGenerate:
             # Mock response
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.json.return_value = openai_response_data
+            mock_response.content = json.dumps(openai_response_data).encode()
             mock_client.request_with_retry.return_value = mock_response
 
             # Call endpoint
@@ -142,6 +168,7 @@ class TestChatRouterGenerate:
 
             # Verify
             assert response.status_code == 200
+            assert response.media_type == "application/json"
             body = json.loads(response.body)
             assert body["model"] == "llama2"
             assert body["response"] == "I'm doing well, thank you!"
@@ -153,6 +180,15 @@ class TestChatRouterGenerate:
             )
             mock_client.request_with_retry.assert_called_once()
 
+            # The request model is serialized to JSON bytes once and sent as-is
+            mock_openai_request.model_dump_json.assert_called_once_with(
+                exclude_none=True
+            )
+            assert (
+                mock_client.request_with_retry.call_args.kwargs["content"]
+                == mock_openai_request.model_dump_json.return_value.encode()
+            )
+
     @pytest.mark.asyncio
     async def test_generate_streaming_success(
         self, mock_settings, mock_translator, mock_request
@@ -165,7 +201,12 @@ class TestChatRouterGenerate:
 
         # Setup mocks
         mock_openai_request = Mock()
-        mock_openai_request.model_dump.return_value = {"model": "gpt-3.5-turbo"}
+        mock_openai_request.model_dump_json.return_value = json.dumps(
+            {
+                "model": "gpt-3.5-turbo",
+                "messages": [{"role": "user", "content": "Hello"}],
+            }
+        )
         mock_translator.translate_request.return_value = mock_openai_request
 
         # Mock streaming chunks
@@ -207,6 +248,10 @@ class TestChatRouterGenerate:
             assert response.status_code == 200
             assert response.headers["content-type"] == "application/x-ndjson"
             assert response.headers["x-request-id"] == "test-request-123"
+            # Chunks must reach the client unbuffered and uncompressed
+            assert response.headers["cache-control"] == "no-cache"
+            assert response.headers["x-accel-buffering"] == "no"
+            assert response.headers["content-encoding"] == "identity"
 
     @pytest.mark.asyncio
     async def test_generate_validation_error(
@@ -237,7 +282,12 @@ class TestChatRouterGenerate:
         """Test generate with upstream error."""
         # Setup mocks
         mock_openai_request = Mock()
-        mock_openai_request.model_dump.return_value = {"model": "gpt-3.5-turbo"}
+        mock_openai_request.model_dump_json.return_value = json.dumps(
+            {
+                "model": "gpt-3.5-turbo",
+                "messages": [{"role": "user", "content": "Hello"}],
+            }
+        )
         mock_openai_request.model = "gpt-3.5-turbo"
         mock_openai_request.messages = [{"role": "user", "content": "Hello"}]
         mock_translator.translate_request.return_value = mock_openai_request
@@ -281,7 +331,12 @@ class TestChatRouterChat:
         """Test successful non-streaming chat request."""
         # Setup mocks
         mock_openai_request = Mock()
-        mock_openai_request.model_dump.return_value = {"model": "gpt-4"}
+        mock_openai_request.model_dump_json.return_value = json.dumps(
+            {
+                "model": "gpt-4",
+                "messages": [{"role": "user", "content": "Hello"}],
+            }
+        )
         mock_openai_request.model = "gpt-4"
         mock_openai_request.messages = [
             {"role": "user", "content": "Hello"},
@@ -292,11 +347,16 @@ class TestChatRouterChat:
         mock_translator.translate_request.return_value = mock_openai_request
 
         mock_ollama_response = Mock()
-        mock_ollama_response.model_dump.return_value = {
-            "model": "mistral",
-            "message": {"role": "assistant", "content": "I'm doing well, thank you!"},
-            "done": True,
-        }
+        mock_ollama_response.model_dump_json.return_value = json.dumps(
+            {
+                "model": "mistral",
+                "message": {
+                    "role": "assistant",
+                    "content": "I'm doing well, thank you!",
+                },
+                "done": True,
+            }
+        )
         mock_translator.translate_response.return_value = mock_ollama_response
 
         # Mock HTTP client
@@ -307,7 +367,7 @@ class TestChatRouterChat:
             # Mock response
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.json.return_value = openai_response_data
+            mock_response.content = json.dumps(openai_response_data).encode()
             mock_client.request_with_retry.return_value = mock_response
 
             # Call endpoint
@@ -320,6 +380,7 @@ class TestChatRouterChat:
 
             # Verify
             assert response.status_code == 200
+            assert response.media_type == "application/json"
             body = json.loads(response.body)
             assert body["model"] == "mistral"
             assert body["done"] is True
@@ -331,7 +392,12 @@ class TestChatRouterChat:
         """Test chat request with timeout."""
         # Setup mocks
         mock_openai_request = Mock()
-        mock_openai_request.model_dump.return_value = {"model": "gpt-4"}
+        mock_openai_request.model_dump_json.return_value = json.dumps(
+            {
+                "model": "gpt-4",
+                "messages": [{"role": "user", "content": "Hello"}],
+            }
+        )
         mock_openai_request.model = "gpt-4"
         mock_openai_request.messages = [{"role": "user", "content": "How are you?"}]
         mock_translator.translate_request.return_value = mock_openai_request
@@ -380,12 +446,181 @@ class TestHTTPClient:
             assert client.timeout > 0
 
 
+class TestUpstreamRequest:
+    """Test requests sent to the OpenAI-compatible backend."""
+
+    @pytest.mark.asyncio
+    async def test_make_openai_request_reuses_prebuilt_url_and_headers(
+        self, openai_chat_request
+    ):
+        """Test every request shares the module-level URL and headers."""
+        from src.config import get_settings
+        from src.routers import chat
+
+        mock_client = AsyncMock()
+        mock_client.request_with_retry.return_value = Mock(status_code=200)
+        await chat.make_openai_request(mock_client, openai_chat_request)
+        await chat.make_openai_request(mock_client, openai_chat_request)
+
+        first, second = mock_client.request_with_retry.call_args_list
+        settings = get_settings()
+        assert first.args == (
+            "POST",
+            f"{settings.OPENAI_API_BASE_URL}/chat/completions",
+        )
+        assert first.kwargs["headers"] == {
+            "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
+            "Content-Type": "application/json",
+        }
+        assert second.kwargs["headers"] is first.kwargs["headers"]
+
+    @pytest.mark.asyncio
+    async def test_make_openai_request_sends_json_bytes(self, openai_chat_request):
+        """Test the body is the model's JSON bytes, not a dict for httpx."""
+        from src.routers import chat
+
+        mock_client = AsyncMock()
+        mock_client.request_with_retry.return_value = Mock(status_code=200)
+
+        await chat.make_openai_request(mock_client, openai_chat_request)
+
+        kwargs = mock_client.request_with_retry.call_args.kwargs
+        assert "json" not in kwargs
+        assert json.loads(kwargs["content"]) == openai_chat_request.model_dump(
+            exclude_none=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_make_openai_request_skips_disabled_debug_log(
+        self, openai_chat_request
+    ):
+        """Test the debug record is not built when DEBUG is disabled."""
+        from src.routers import chat
+
+        mock_client = AsyncMock()
+        mock_client.request_with_retry.return_value = Mock(status_code=200)
+
+        with patch.object(chat, "logger") as mock_logger:
+            mock_logger.isEnabledFor.return_value = False
+            await chat.make_openai_request(mock_client, openai_chat_request)
+
+        mock_logger.debug.assert_not_called()
+
+
+class TestTranslator:
+    """Test the lazily created chat translator."""
+
+    def test_get_translator_returns_shared_instance(self):
+        """Test the translator is built on first use and then reused."""
+        from src.routers.chat import get_translator
+        from src.translators.chat import ChatTranslator
+
+        get_translator.cache_clear()
+        with patch("src.routers.chat.ChatTranslator", wraps=ChatTranslator) as cls:
+            first = get_translator()
+            second = get_translator()
+
+        assert first is second
+        assert isinstance(first, ChatTranslator)
+        cls.assert_called_once_with()
+        get_translator.cache_clear()
+
+
+class TestResponseCache:
+    """Test the non-streaming response cache."""
+
+    def test_key_requires_reproducible_request(self, response_cache):
+        """Test only greedy or seeded requests get a cache key."""
+        from src.routers.chat import response_cache_key
+
+        response_cache.maxsize = 10
+        messages = [{"role": "user", "content": "Hello"}]
+
+        sampled = OpenAIChatRequest(model="gpt-4", messages=messages)
+        greedy = OpenAIChatRequest(model="gpt-4", messages=messages, temperature=0)
+        seeded = OpenAIChatRequest(model="gpt-4", messages=messages, seed=7)
+
+        assert response_cache_key("chat", "llama2", sampled) is None
+        assert response_cache_key("chat", "llama2", greedy) is not None
+        assert response_cache_key("chat", "llama2", seeded) is not None
+        assert response_cache_key("chat", "llama2", greedy) != response_cache_key(
+            "generate", "llama2", greedy
+        )
+
+    def test_key_is_none_when_disabled(self):
+        """Test a zero-size cache never produces keys."""
+        from src.routers.chat import response_cache_key
+
+        greedy = OpenAIChatRequest(
+            model="gpt-4",
+            messages=[{"role": "user", "content": "Hello"}],
+            temperature=0,
+        )
+        assert response_cache_key("chat", "llama2", greedy) is None
+
+    @pytest.mark.asyncio
+    async def test_generate_repeat_served_from_cache(
+        self,
+        mock_settings,
+        mock_translator,
+        mock_request,
+        response_cache,
+        openai_response_data,
+    ):
+        """Test a repeated greedy request skips the upstream call."""
+        from src.routers.chat import generate
+
+        response_cache.maxsize = 10
+        request = OllamaGenerateRequest(
+            model="llama2",
+            prompt="Hello",
+            stream=False,
+            options=OllamaOptions(temperature=0),
+        )
+        mock_translator.translate_request.return_value = OpenAIChatRequest(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": "Hello"}],
+            temperature=0,
+        )
+        mock_ollama_response = Mock()
+        mock_ollama_response.model_dump_json.return_value = json.dumps(
+            {"model": "llama2", "response": "Hi", "done": True}
+        )
+        mock_translator.translate_response.return_value = mock_ollama_response
+
+        with patch("src.routers.chat.retry_client_context") as mock_client_ctx:
+            mock_client = AsyncMock()
+            mock_client_ctx.return_value.__aenter__.return_value = mock_client
+            mock_response = Mock()
+            mock_response.status_code = 200
+            mock_response.content = json.dumps(openai_response_data).encode()
+            mock_client.request_with_retry.return_value = mock_response
+
+            with patch("src.routers.chat.get_body_json") as mock_get_body:
+                mock_get_body.return_value = request.model_dump()
+                first = await generate(mock_request)
+                second = await generate(mock_request)
+
+        assert second.body == first.body
+        assert json.loads(second.body)["response"] == "Hi"
+        assert second.headers["x-request-id"] == "test-request-123"
+        assert first.headers["x-cache"] == "MISS"
+        assert second.headers["x-cache"] == "HIT"
+        mock_client.request_with_retry.assert_called_once()
+        mock_translator.translate_response.assert_called_once()
+        assert len(response_cache) == 1
+
+
 class TestStreamingResponse:
     """Test streaming response handling."""
 
     @pytest.mark.asyncio
     async def test_stream_response_parsing(
-        self, mock_settings, mock_translator, ollama_generate_request
+        self,
+        mock_settings,
+        mock_translator,
+        ollama_generate_request,
+        openai_chat_request,
     ):
         """Test parsing of streaming response chunks."""
         from src.routers.chat import stream_response
@@ -423,15 +658,10 @@ class TestStreamingResponse:
         # Mock stream_with_retry to return our async generator
         mock_client.stream_with_retry = mock_stream_chunks
 
-        mock_openai_request = Mock()
-        mock_openai_request.model_dump.return_value = {"model": "gpt-3.5-turbo"}
-        mock_openai_request.model = "gpt-3.5-turbo"
-        mock_openai_request.messages = [{"role": "user", "content": "Hello"}]
-
         # Stream response
         chunks = []
         async for chunk in stream_response(
-            mock_client, mock_openai_request, ollama_generate_request
+            mock_client, openai_chat_request, ollama_generate_request
         ):
             chunks.append(chunk)
 
@@ -443,3 +673,107 @@ class TestStreamingResponse:
 
         # Verify invalid JSON was skipped
         assert len(chunks_received) == 3  # Only valid chunks
+
+    @pytest.mark.asyncio
+    async def test_stream_response_yields_ndjson_bytes(
+        self,
+        mock_settings,
+        mock_translator,
+        ollama_generate_request,
+        openai_chat_request,
+    ):
+        """Test streamed chunks are newline-terminated UTF-8 JSON bytes."""
+        from src.routers.chat import stream_response
+
+        def translate(chunk, request, **kwargs):
+            if chunk == "[DONE]":
+                return {"response": "", "done": True}
+            return {"response": chunk["choices"][0]["delta"]["content"]}
+
+        mock_translator.translate_streaming_response.side_effect = translate
+
+        async def mock_stream_chunks(*args, **kwargs):
+            yield 'data: {"choices": [{"delta": {"content": "héllo 世界"}}]}\n'.encode()
+            yield b"data: [DONE]\n"
+
+        mock_client = AsyncMock()
+        mock_client.stream_with_retry = mock_stream_chunks
+
+        chunks = [
+            chunk
+            async for chunk in stream_response(
+                mock_client, openai_chat_request, ollama_generate_request
+            )
+        ]
+
+        assert all(isinstance(chunk, bytes) for chunk in chunks)
+        assert all(chunk.endswith(b"\n") for chunk in chunks)
+        assert json.loads(chunks[0])["response"] == "héllo 世界"
+        assert json.loads(chunks[1])["done"] is True
+
+    @pytest.mark.asyncio
+    async def test_stream_response_handles_lines_split_across_chunks(
+        self,
+        mock_settings,
+        mock_translator,
+        ollama_generate_request,
+        openai_chat_request,
+    ):
+        """Test SSE lines split across network chunks are reassembled."""
+        from src.routers.chat import stream_response
+
+        def translate(chunk, request, **kwargs):
+            if chunk == "[DONE]":
+                return {"response": "", "done": True}
+            return {"response": chunk["choices"][0]["delta"]["content"]}
+
+        mock_translator.translate_streaming_response.side_effect = translate
+
+        # A multi-byte character is split between chunks as well
+        payload = 'data: {"choices": [{"delta": {"content": "Hé"}}]}\ndata: [DONE]\n'
+        raw = payload.encode()
+
+        async def mock_stream_chunks(*args, **kwargs):
+            for i in range(0, len(raw), 7):
+                yield raw[i : i + 7]
+
+        mock_client = AsyncMock()
+        mock_client.stream_with_retry = mock_stream_chunks
+
+        chunks = [
+            chunk
+            async for chunk in stream_response(
+                mock_client, openai_chat_request, ollama_generate_request
+            )
+        ]
+
+        assert [json.loads(chunk) for chunk in chunks] == [
+            {"response": "Hé"},
+            {"response": "", "done": True},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_openai_stream_passthrough_yields_raw_bytes(self, mock_settings):
+        """Test OpenAI-format streams are forwarded as the upstream bytes."""
+        from src.routers.chat import openai_stream_response_dict
+
+        # A multi-byte character split across two upstream chunks
+        raw = 'data: {"content": "Hé"}\n\n'.encode()
+        parts = [raw[:21], raw[21:]]
+
+        async def mock_stream_chunks(*args, **kwargs):
+            for part in parts:
+                yield part
+
+        mock_client = AsyncMock()
+        mock_client.stream_with_retry = mock_stream_chunks
+
+        chunks = [
+            chunk
+            async for chunk in openai_stream_response_dict(
+                mock_client, {"model": "gpt-3.5-turbo", "stream": True}
+            )
+        ]
+
+        assert chunks == parts
+        assert b"".join(chunks) == raw
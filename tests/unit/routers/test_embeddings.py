@@ -2,12 +2,13 @@
 Unit tests for the embeddings router.
 """
 
+import json
 from unittest.mock import AsyncMock, Mock, patch
 
 import httpx
 import pytest
 from fastapi import HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from src.models import (
     OllamaEmbeddingRequest,
@@ -19,6 +20,7 @@ from src.models import (
 from src.routers.embeddings import (
     create_embed_ollama_style,
     create_embeddings_ollama_style,
+    create_embeddings_openai_style,
     router,
 )
 from src.utils.exceptions import ValidationError
@@ -75,7 +77,7 @@ class TestEmbeddingsEndpoint:
         # Mock successful HTTP response
         mock_http_response = Mock()
         mock_http_response.status_code = 200
-        mock_http_response.json.return_value = sample_openai_response.model_dump()
+        mock_http_response.content = sample_openai_response.model_dump_json().encode()
         mock_client.request_with_retry.return_value = mock_http_response
 
         # Mock translator methods
@@ -94,7 +96,8 @@ class TestEmbeddingsEndpoint:
             result = await create_embeddings_ollama_style(mock_request)
 
         # Verify result
-        assert isinstance(result, JSONResponse)
+        assert isinstance(result, Response)
+        assert result.media_type == "application/json"
         assert result.headers["X-Request-ID"] == "test-embeddings-123"
 
         # Verify translator was called
@@ -206,6 +209,33 @@ class TestEmbeddingsEndpoint:
 
         assert exc_info.value.status_code == 502
 
+    @pytest.mark.asyncio
+    @patch("src.routers.embeddings.retry_client_context")
+    async def test_create_embeddings_openai_style_relays_body(
+        self, mock_client_context, mock_request, sample_openai_response
+    ):
+        """Test OpenAI-style responses are relayed without re-encoding."""
+        mock_client = AsyncMock()
+        mock_client_context.return_value.__aenter__.return_value = mock_client
+
+        upstream_body = sample_openai_response.model_dump_json().encode()
+        mock_http_response = Mock()
+        mock_http_response.status_code = 200
+        mock_http_response.content = upstream_body
+        mock_client.request_with_retry.return_value = mock_http_response
+
+        with patch("src.routers.embeddings.get_body_json") as mock_get_body:
+            mock_get_body.return_value = {
+                "model": "text-embedding-ada-002",
+                "input": "Test embedding text",
+            }
+            result = await create_embeddings_openai_style(mock_request)
+
+        assert result.body == upstream_body
+        assert result.media_type == "application/json"
+        assert result.headers["X-Request-ID"] == "test-embeddings-123"
+        mock_http_response.json.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_create_embeddings_batch_input(self, mock_request):
         """Test embeddings endpoint with batch input."""
@@ -225,16 +255,20 @@ class TestEmbeddingsEndpoint:
 
             mock_http_response = Mock()
             mock_http_response.status_code = 200
-            mock_http_response.json.return_value = {
-                "object": "list",
-                "data": [{"object": "embedding", "index": 0, "embedding": [0.1, 0.2]}],
-                "model": "text-embedding-ada-002",
-                "usage": {
-                    "prompt_tokens": 10,
-                    "completion_tokens": 0,
-                    "total_tokens": 10,
-                },
-            }
+            mock_http_response.content = json.dumps(
+                {
+                    "object": "list",
+                    "data": [
+                        {"object": "embedding", "index": 0, "embedding": [0.1, 0.2]}
+                    ],
+                    "model": "text-embedding-ada-002",
+                    "usage": {
+                        "prompt_tokens": 10,
+                        "completion_tokens": 0,
+                        "total_tokens": 10,
+                    },
+                }
+            ).encode()
             mock_client.request_with_retry.return_value = mock_http_response
 
             mock_translator.validate_model_name.return_value = None
@@ -252,7 +286,8 @@ class TestEmbeddingsEndpoint:
                 result = await create_embeddings_ollama_style(mock_request)
 
             # Verify result
-            assert isinstance(result, JSONResponse)
+            assert isinstance(result, Response)
+            assert result.media_type == "application/json"
             mock_translator.translate_request.assert_called_once_with(batch_request)
 
     def test_router_configured(self):
@@ -326,7 +361,7 @@ class TestEmbedEndpoint:
         # Mock successful HTTP response
         mock_http_response = Mock()
         mock_http_response.status_code = 200
-        mock_http_response.json.return_value = sample_openai_response.model_dump()
+        mock_http_response.content = sample_openai_response.model_dump_json().encode()
         mock_client.request_with_retry.return_value = mock_http_response
 
         # Mock translator methods
@@ -379,7 +414,7 @@ class TestEmbedEndpoint:
         # Mock successful HTTP response
         mock_http_response = Mock()
         mock_http_response.status_code = 200
-        mock_http_response.json.return_value = sample_openai_response.model_dump()
+        mock_http_response.content = sample_openai_response.model_dump_json().encode()
         mock_client.request_with_retry.return_value = mock_http_response
 
         # Mock translator methods
@@ -493,16 +528,20 @@ class TestEmbedEndpoint:
 
             mock_http_response = Mock()
             mock_http_response.status_code = 200
-            mock_http_response.json.return_value = {
-                "object": "list",
-                "data": [{"object": "embedding", "index": 0, "embedding": [0.1, 0.2]}],
-                "model": "text-embedding-ada-002",
-                "usage": {
-                    "prompt_tokens": 10,
-                    "completion_tokens": 0,
-                    "total_tokens": 10,
-                },
-            }
+            mock_http_response.content = json.dumps(
+                {
+                    "object": "list",
+                    "data": [
+                        {"object": "embedding", "index": 0, "embedding": [0.1, 0.2]}
+                    ],
+                    "model": "text-embedding-ada-002",
+                    "usage": {
+                        "prompt_tokens": 10,
+                        "completion_tokens": 0,
+                        "total_tokens": 10,
+                    },
+                }
+            ).encode()
             mock_client.request_with_retry.return_value = mock_http_response
 
             mock_translator.validate_model_name.return_value = None
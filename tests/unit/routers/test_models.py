@@ -9,7 +9,7 @@ from unittest.mock import AsyncMock, Mock, patch
 import httpx
 import pytest
 from fastapi import HTTPException, Request
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 
 from src.models import (
     OllamaDeleteRequest,
@@ -101,16 +101,16 @@ class TestModelListing:
         self, mock_settings, mock_request, openai_models_response
     ):
         """Test successful model listing."""
-        with patch("src.routers.models.httpx.AsyncClient") as mock_client_class:
+        with patch("src.routers.models.retry_client_context") as mock_client_ctx:
             # Mock the async client
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_ctx.return_value.__aenter__.return_value = mock_client
 
             # Mock response
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = openai_models_response
-            mock_client.get.return_value = mock_response
+            mock_client.client.get.return_value = mock_response
 
             # Call endpoint
             from src.routers.models import list_models
@@ -118,7 +118,8 @@ class TestModelListing:
             result = await list_models(mock_request)
 
             # Verify result
-            assert isinstance(result, JSONResponse)
+            assert isinstance(result, Response)
+            assert result.media_type == "application/json"
 
             # Get the response content
             response_data = result.body.decode("utf-8")
@@ -138,30 +139,33 @@ class TestModelListing:
             assert model["details"]["family"] == "openai"
 
             # Verify API call
-            mock_client.get.assert_called_once_with(
+            mock_client.client.get.assert_called_once_with(
                 f"{mock_settings.OPENAI_API_BASE_URL}/models",
                 headers={"Authorization": f"Bearer {mock_settings.OPENAI_API_KEY}"},
             )
+            # A plain GET, bypassing retries and the shared circuit breaker
+            mock_client.request_with_retry.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_list_models_empty(self, mock_settings, mock_request):
         """Test listing models with empty response."""
-        with patch("src.routers.models.httpx.AsyncClient") as mock_client_class:
+        with patch("src.routers.models.retry_client_context") as mock_client_ctx:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_ctx.return_value.__aenter__.return_value = mock_client
 
             # Mock empty response
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"object": "list", "data": []}
-            mock_client.get.return_value = mock_response
+            mock_client.client.get.return_value = mock_response
 
             # Call endpoint
             from src.routers.models import list_models
 
             result = await list_models(mock_request)
 
-            assert isinstance(result, JSONResponse)
+            assert isinstance(result, Response)
+            assert result.media_type == "application/json"
 
             # Get the response content
             response_data = result.body.decode("utf-8")
@@ -177,16 +181,16 @@ class TestModelListing:
         self, mock_settings, mock_request, openrouter_models_response
     ):
         """Test successful model listing with OpenRouter response (no owned_by field)."""
-        with patch("src.routers.models.httpx.AsyncClient") as mock_client_class:
+        with patch("src.routers.models.retry_client_context") as mock_client_ctx:
             # Mock the async client
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_ctx.return_value.__aenter__.return_value = mock_client
 
             # Mock response
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = openrouter_models_response
-            mock_client.get.return_value = mock_response
+            mock_client.client.get.return_value = mock_response
 
             # Call endpoint
             from src.routers.models import list_models
@@ -194,7 +198,8 @@ class TestModelListing:
             result = await list_models(mock_request)
 
             # Verify result
-            assert isinstance(result, JSONResponse)
+            assert isinstance(result, Response)
+            assert result.media_type == "application/json"
 
             # Get the response content
             response_data = result.body.decode("utf-8")
@@ -218,15 +223,15 @@ class TestModelListing:
     @pytest.mark.asyncio
     async def test_list_models_upstream_error(self, mock_settings, mock_request):
         """Test model listing with upstream error."""
-        with patch("src.routers.models.httpx.AsyncClient") as mock_client_class:
+        with patch("src.routers.models.retry_client_context") as mock_client_ctx:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_ctx.return_value.__aenter__.return_value = mock_client
 
             # Mock error response
             mock_response = Mock()
             mock_response.status_code = 503
             mock_response.text = "Service unavailable"
-            mock_client.get.return_value = mock_response
+            mock_client.client.get.return_value = mock_response
 
             # Call endpoint
             from src.routers.models import list_models
@@ -240,12 +245,14 @@ class TestModelListing:
     @pytest.mark.asyncio
     async def test_list_models_timeout(self, mock_settings, mock_request):
         """Test model listing with timeout."""
-        with patch("src.routers.models.httpx.AsyncClient") as mock_client_class:
+        with patch("src.routers.models.retry_client_context") as mock_client_ctx:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_ctx.return_value.__aenter__.return_value = mock_client
 
             # Mock timeout
-            mock_client.get.side_effect = httpx.TimeoutException("Request timeout")
+            mock_client.client.get.side_effect = httpx.TimeoutException(
+                "Request timeout"
+            )
 
             # Call endpoint
             from src.routers.models import list_models
@@ -344,15 +351,15 @@ class TestShowModel:
         """Test showing basic model information."""
         request = OllamaShowRequest(name="gpt-3.5-turbo", verbose=False)
 
-        with patch("src.routers.models.httpx.AsyncClient") as mock_client_class:
+        with patch("src.routers.models.retry_client_context") as mock_client_ctx:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_ctx.return_value.__aenter__.return_value = mock_client
 
             # Mock models list response for verification
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = openai_models_response
-            mock_client.get.return_value = mock_response
+            mock_client.client.get.return_value = mock_response
 
             # Call endpoint
             from src.routers.models import show_model
@@ -360,7 +367,8 @@ class TestShowModel:
             result = await show_model(request, mock_request)
 
             # Verify result
-            assert isinstance(result, JSONResponse)
+            assert isinstance(result, Response)
+            assert result.media_type == "application/json"
 
             # Get the response content
             response_data = result.body.decode("utf-8")
@@ -382,9 +390,9 @@ class TestShowModel:
         """Test showing verbose model information."""
         request = OllamaShowRequest(name="llama2:7b", verbose=True)
 
-        with patch("src.routers.models.httpx.AsyncClient") as mock_client_class:
+        with patch("src.routers.models.retry_client_context") as mock_client_ctx:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_ctx.return_value.__aenter__.return_value = mock_client
 
             # Mock models list response
             mock_response = Mock()
@@ -400,7 +408,7 @@ class TestShowModel:
                     }
                 ],
             }
-            mock_client.get.return_value = mock_response
+            mock_client.client.get.return_value = mock_response
 
             # Call endpoint
             from src.routers.models import show_model
@@ -408,7 +416,8 @@ class TestShowModel:
             result = await show_model(request, mock_request)
 
             # Verify verbose output
-            assert isinstance(result, JSONResponse)
+            assert isinstance(result, Response)
+            assert result.media_type == "application/json"
 
             # Get the response content
             response_data = result.body.decode("utf-8")
@@ -431,15 +440,15 @@ class TestShowModel:
         """Test showing non-existent model."""
         request = OllamaShowRequest(name="non-existent-model", verbose=False)
 
-        with patch("src.routers.models.httpx.AsyncClient") as mock_client_class:
+        with patch("src.routers.models.retry_client_context") as mock_client_ctx:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_ctx.return_value.__aenter__.return_value = mock_client
 
             # Mock models list response without the requested model
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = openai_models_response
-            mock_client.get.return_value = mock_response
+            mock_client.client.get.return_value = mock_response
 
             # Call endpoint
             from src.routers.models import show_model
@@ -455,12 +464,12 @@ class TestShowModel:
         """Test show model when verification fails."""
         request = OllamaShowRequest(name="some-model", verbose=False)
 
-        with patch("src.routers.models.httpx.AsyncClient") as mock_client_class:
+        with patch("src.routers.models.retry_client_context") as mock_client_ctx:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_ctx.return_value.__aenter__.return_value = mock_client
 
             # Mock request error during verification
-            mock_client.get.side_effect = httpx.RequestError("Connection failed")
+            mock_client.client.get.side_effect = httpx.RequestError("Connection failed")
 
             # Call endpoint - should proceed anyway
             from src.routers.models import show_model
@@ -468,7 +477,8 @@ class TestShowModel:
             result = await show_model(request, mock_request)
 
             # Should still return basic info
-            assert isinstance(result, JSONResponse)
+            assert isinstance(result, Response)
+            assert result.media_type == "application/json"
 
             # Get the response content
             response_data = result.body.decode("utf-8")
@@ -486,9 +496,9 @@ class TestModelTransformation:
     @pytest.mark.asyncio
     async def test_timestamp_conversion(self, mock_settings, mock_request):
         """Test proper timestamp conversion from Unix to ISO."""
-        with patch("src.routers.models.httpx.AsyncClient") as mock_client_class:
+        with patch("src.routers.models.retry_client_context") as mock_client_ctx:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_ctx.return_value.__aenter__.return_value = mock_client
 
             # Mock response with specific timestamp
             mock_response = Mock()
@@ -504,7 +514,7 @@ class TestModelTransformation:
                     }
                 ],
             }
-            mock_client.get.return_value = mock_response
+            mock_client.client.get.return_value = mock_response
 
             # Call endpoint
             from src.routers.models import list_models
@@ -512,7 +522,8 @@ class TestModelTransformation:
             result = await list_models(mock_request)
 
             # Check timestamp format
-            assert isinstance(result, JSONResponse)
+            assert isinstance(result, Response)
+            assert result.media_type == "application/json"
 
             # Get the response content
             response_data = result.body.decode("utf-8")
@@ -536,9 +547,9 @@ class TestModelTransformation:
     @pytest.mark.asyncio
     async def test_digest_generation(self, mock_settings, mock_request):
         """Test consistent digest generation from model ID."""
-        with patch("src.routers.models.httpx.AsyncClient") as mock_client_class:
+        with patch("src.routers.models.retry_client_context") as mock_client_ctx:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_ctx.return_value.__aenter__.return_value = mock_client
 
             # Mock response
             mock_response = Mock()
@@ -560,7 +571,7 @@ class TestModelTransformation:
                     },
                 ],
             }
-            mock_client.get.return_value = mock_response
+            mock_client.client.get.return_value = mock_response
 
             # Call endpoint
             from src.routers.models import list_models
@@ -568,7 +579,8 @@ class TestModelTransformation:
             result = await list_models(mock_request)
 
             # Both instances of same model should have same digest
-            assert isinstance(result, JSONResponse)
+            assert isinstance(result, Response)
+            assert result.media_type == "application/json"
 
             # Get the response content
             response_data = result.body.decode("utf-8")
@@ -196,6 +196,43 @@ class TestSettings:
             with pytest.raises(ValidationError):
                 Settings()
 
+        # Test connection pool validation
+        env = {**base_env, "HTTPX_MAX_CONNECTIONS": "0"}
+        with patch.dict(os.environ, env, clear=True):
+            with pytest.raises(ValidationError):
+                Settings()
+
+        env = {**base_env, "HTTPX_KEEPALIVE_EXPIRY": "-1"}
+        with patch.dict(os.environ, env, clear=True):
+            with pytest.raises(ValidationError):
+                Settings()
+
+        with patch.dict(os.environ, base_env, clear=True):
+            settings = Settings()
+            assert settings.HTTPX_MAX_CONNECTIONS == 1000
+            assert settings.HTTPX_MAX_KEEPALIVE_CONNECTIONS == 256
+            assert settings.HTTPX_KEEPALIVE_EXPIRY == 75.0
+
+        # Test response cache validation
+        env = {**base_env, "RESPONSE_CACHE_SIZE": "-1"}
+        with patch.dict(os.environ, env, clear=True):
+            with pytest.raises(ValidationError):
+                Settings()
+
+        env = {**base_env, "RESPONSE_CACHE_TTL": "0"}
+        with patch.dict(os.environ, env, clear=True):
+            with pytest.raises(ValidationError):
+                Settings()
+
+        env = {**base_env, "RESPONSE_CACHE_MAX_BYTES": "0"}
+        with patch.dict(os.environ, env, clear=True):
+            with pytest.raises(ValidationError):
+                Settings()
+
+        # The response cache is opt-in
+        with patch.dict(os.environ, base_env, clear=True):
+            assert Settings().RESPONSE_CACHE_SIZE == 0
+
     def test_timeout_retry_warning(self):
         """Test warning when timeout * retries exceeds threshold."""
         env = {
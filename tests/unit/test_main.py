@@ -2,6 +2,7 @@
 Unit tests for the main FastAPI application.
 """
 
+import os
 import uuid
 from unittest.mock import Mock, patch
 
@@ -9,7 +10,7 @@ import pytest
 from fastapi import Request
 from fastapi.testclient import TestClient
 
-from src.main import add_request_id_middleware, app
+from src.main import RequestIdPool, add_request_id_middleware, app
 from src.utils.exceptions import ProxyException, UpstreamError
 
 
@@ -264,6 +265,21 @@ class TestRouterIntegration:
             response = client.get("/api/embeddings")
             assert response.status_code in [404, 405, 422]
 
+    def test_shared_routes_served_under_both_prefixes(self, client):
+        """Test /v1 and /api routes are documented with their own tags."""
+        assert client.get("/v1/metrics/health").status_code == 200
+        assert client.get("/api/metrics/health").status_code == 200
+
+        paths = client.get("/openapi.json").json()["paths"]
+        assert not any("{api_prefix}" in path for path in paths)
+        assert paths["/v1/metrics/health"]["get"]["tags"] == ["metrics"]
+        assert paths["/api/metrics/health"]["get"]["tags"] == ["ollama-metrics"]
+
+    def test_version_prefixes_keep_their_handlers(self, client):
+        """Test /v1/version is the proxy version and /api/version Ollama's."""
+        assert "version_info" in client.get("/v1/version").json()
+        assert "version_info" not in client.get("/api/version").json()
+
 
 class TestApplicationSettings:
     """Test application settings and configuration."""
@@ -323,6 +339,37 @@ class TestLifespan:
             # Check shutdown log
             mock_logger.info.assert_called_with("Shutting down Ollama-OpenAI Proxy")
 
+    @pytest.mark.asyncio
+    async def test_lifespan_creates_shared_http_client(self):
+        """Test lifespan creates the global retry client at startup."""
+        from src.main import lifespan
+        from src.utils import http_client
+        from src.utils.http_client import close_global_client, get_retry_client
+
+        await close_global_client()
+
+        async with lifespan(Mock()):
+            startup_client = http_client._retry_client
+            assert startup_client is not None
+            async with http_client.retry_client_context() as client:
+                assert client is startup_client
+
+        # Shutdown closes the global client so a fresh one is built next time
+        assert http_client._retry_client is None
+        assert await get_retry_client() is not startup_client
+        await close_global_client()
+
+    @pytest.mark.asyncio
+    async def test_lifespan_builds_chat_translator(self):
+        """Test the chat translator is ready before the first request."""
+        from src.main import lifespan
+        from src.routers.chat import get_translator
+
+        get_translator.cache_clear()
+
+        async with lifespan(Mock()):
+            assert get_translator.cache_info().currsize == 1
+
 
 class TestRequestIDMiddleware:
     """Test request ID middleware functionality."""
@@ -358,3 +405,61 @@ class TestRequestIDMiddleware:
 
         assert mock_request.state.request_id == existing_id
         assert response.headers["X-Request-ID"] == existing_id
+
+    @pytest.mark.asyncio
+    async def test_generated_request_id_is_uuid_hex(self):
+        """Test a missing or empty header gets a fresh hex UUID."""
+
+        async def mock_call_next(request):
+            response = Mock()
+            response.headers = {}
+            return response
+
+        for headers in ({}, {"X-Request-ID": ""}):
+            mock_request = Mock(spec=Request)
+            mock_request.headers = headers
+            mock_request.state = Mock()
+
+            await add_request_id_middleware(mock_request, mock_call_next)
+
+            request_id = mock_request.state.request_id
+            assert uuid.UUID(hex=request_id).hex == request_id
+
+
+class TestRequestIdPool:
+    """Test the batched request ID generator."""
+
+    def test_ids_are_unique_hex_across_refills(self):
+        """Test IDs stay unique when the random block is refilled."""
+        pool = RequestIdPool()
+        per_block = RequestIdPool.BLOCK_SIZE // RequestIdPool.ID_BYTES
+
+        ids = [pool.next_hex() for _ in range(per_block * 2 + 1)]
+
+        assert len(set(ids)) == len(ids)
+        assert all(len(request_id) == 32 for request_id in ids)
+        assert all(uuid.UUID(hex=request_id).hex == request_id for request_id in ids)
+
+    def test_one_urandom_call_per_block(self):
+        """Test randomness is read once per block, not once per ID."""
+        pool = RequestIdPool()
+        per_block = RequestIdPool.BLOCK_SIZE // RequestIdPool.ID_BYTES
+
+        with patch("src.main.os.urandom", wraps=os.urandom) as mock_urandom:
+            for _ in range(per_block):
+                pool.next_hex()
+            assert mock_urandom.call_count == 1
+
+            pool.next_hex()
+            assert mock_urandom.call_count == 2
+
+    def test_reset_discards_buffered_randomness(self):
+        """Test reset forces a fresh block, as done after fork."""
+        pool = RequestIdPool()
+        pool.next_hex()
+        buffered = pool._buffer
+
+        pool.reset()
+        pool.next_hex()
+
+        assert pool._buffer is not buffered
@@ -107,6 +107,17 @@ class TestBaseTranslator:
         # Test no mapping (returns original)
         assert translator.reverse_map_model_name("claude-2") == "claude-2"
 
+    def test_model_mappings_reassignment_updates_lookups(self):
+        """Test both lookup directions follow a replaced mapping."""
+        translator = ConcreteTranslator(model_mappings={"llama2": "gpt-3.5-turbo"})
+
+        translator.model_mappings = {"mistral": "gpt-4"}
+
+        assert translator.map_model_name("mistral") == "gpt-4"
+        assert translator.map_model_name("llama2") == "llama2"
+        assert translator.reverse_map_model_name("gpt-4") == "mistral"
+        assert translator.reverse_map_model_name("gpt-3.5-turbo") == "gpt-3.5-turbo"
+
     @patch("src.translators.base.get_settings")
     def test_extract_options_with_ollama_options(self, mock_settings):
         """Test extracting options from OllamaOptions object."""
@@ -148,6 +159,13 @@ class TestBaseTranslator:
         result = translator.extract_options(options)
         assert result == {}
 
+    def test_extract_options_unlimited_num_predict(self):
+        """Test num_predict=0 (unlimited) is not sent as max_tokens."""
+        translator = ConcreteTranslator()
+        options = OllamaOptions(num_predict=0, temperature=0.5)
+        result = translator.extract_options(options)
+        assert result == {"temperature": 0.5}
+
     def test_extract_ollama_options(self):
         """Test extracting OpenAI params to Ollama options."""
         translator = ConcreteTranslator()
@@ -379,3 +379,29 @@ class TestIntegration:
         else:
             # Just verify client is configured
             assert client.client is not None
+
+    @pytest.mark.asyncio
+    async def test_connection_pool_limits_from_settings(self):
+        """Test pool limits come from the HTTPX_* settings."""
+        from src.config import get_settings
+
+        settings = get_settings().model_copy(
+            update={
+                "HTTPX_MAX_CONNECTIONS": 42,
+                "HTTPX_MAX_KEEPALIVE_CONNECTIONS": 7,
+                "HTTPX_KEEPALIVE_EXPIRY": 12.5,
+            }
+        )
+
+        with patch("src.utils.http_client.get_settings", return_value=settings):
+            with patch(
+                "src.utils.http_client.httpx.Limits", wraps=httpx.Limits
+            ) as mock_limits:
+                client = RetryClient()
+
+        mock_limits.assert_called_once_with(
+            max_connections=42,
+            max_keepalive_connections=7,
+            keepalive_expiry=12.5,
+        )
+        await client.close()
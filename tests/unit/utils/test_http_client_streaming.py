@@ -2,6 +2,7 @@
 Additional tests for HTTP client streaming functionality.
 """
 
+import gzip
 from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, Mock, patch
 
@@ -26,11 +27,11 @@ class TestStreamingRetry:
 
         chunks = [b"chunk1", b"chunk2", b"chunk3"]
 
-        async def mock_aiter_raw():
+        async def mock_aiter_bytes():
             for chunk in chunks:
                 yield chunk
 
-        mock_response.aiter_raw = mock_aiter_raw
+        mock_response.aiter_bytes = mock_aiter_bytes
 
         @asynccontextmanager
         async def mock_stream(*args, **kwargs):
@@ -65,10 +66,10 @@ class TestStreamingRetry:
                 mock_response.status_code = 200
                 mock_response.raise_for_status = Mock()
 
-                async def mock_aiter_raw():
+                async def mock_aiter_bytes():
                     yield b"success after retry"
 
-                mock_response.aiter_raw = mock_aiter_raw
+                mock_response.aiter_bytes = mock_aiter_bytes
                 yield mock_response
 
         with patch.object(client.client, "stream", mock_stream):
@@ -104,10 +105,10 @@ class TestStreamingRetry:
                 mock_response.status_code = 200
                 mock_response.raise_for_status = Mock()
 
-                async def mock_aiter_raw():
+                async def mock_aiter_bytes():
                     yield b"success"
 
-                mock_response.aiter_raw = mock_aiter_raw
+                mock_response.aiter_bytes = mock_aiter_bytes
 
             yield mock_response
 
@@ -177,10 +178,10 @@ class TestStreamingRetry:
 
             mock_response.raise_for_status = Mock()
 
-            async def mock_aiter_raw():
+            async def mock_aiter_bytes():
                 yield f"attempt {attempt_count}".encode()
 
-            mock_response.aiter_raw = mock_aiter_raw
+            mock_response.aiter_bytes = mock_aiter_bytes
             yield mock_response
 
         with patch.object(client.client, "stream", mock_stream):
@@ -193,3 +194,30 @@ class TestStreamingRetry:
             # Should have made 2 attempts (retry on 429, not on 500)
             assert attempt_count == 2
             assert chunks == ["attempt 2"]
+
+
+class TestStreamingDecoding:
+    """Test streamed bodies are decoded before being yielded."""
+
+    @pytest.mark.asyncio
+    async def test_streaming_decodes_gzip_content_encoding(self):
+        """Test a gzip-encoded SSE body is yielded as plain bytes."""
+        body = b'data: {"choices": []}\n\ndata: [DONE]\n\n'
+
+        def handler(request):
+            return httpx.Response(
+                200,
+                headers={"Content-Encoding": "gzip"},
+                content=gzip.compress(body),
+            )
+
+        client = RetryClient(max_retries=1)
+        await client.client.aclose()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        chunks = [
+            chunk async for chunk in client.stream_with_retry("POST", "http://test.com")
+        ]
+        await client.close()
+
+        assert b"".join(chunks) == body
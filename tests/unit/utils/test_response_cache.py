@@ -0,0 +1,100 @@
+"""
+Tests for the in-memory response cache.
+"""
+
+from src.utils.response_cache import ResponseCache
+
+
+class FakeTimer:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestResponseCache:
+    """Test ResponseCache behavior."""
+
+    def test_get_returns_stored_value(self):
+        """Test a stored body is returned for its key."""
+        cache = ResponseCache(maxsize=2, ttl=60)
+        cache.set(b"a", b"body")
+
+        assert cache.get(b"a") == b"body"
+        assert cache.get(b"missing") is None
+
+    def test_evicts_least_recently_used(self):
+        """Test the entry not read for longest is evicted when full."""
+        cache = ResponseCache(maxsize=2, ttl=60)
+        cache.set(b"a", b"1")
+        cache.set(b"b", b"2")
+        cache.get(b"a")
+        cache.set(b"c", b"3")
+
+        assert cache.get(b"b") is None
+        assert cache.get(b"a") == b"1"
+        assert cache.get(b"c") == b"3"
+        assert len(cache) == 2
+
+    def test_entries_expire_after_ttl(self):
+        """Test entries older than the TTL are treated as missing and dropped."""
+        timer = FakeTimer()
+        cache = ResponseCache(maxsize=2, ttl=10, timer=timer)
+        cache.set(b"a", b"1")
+
+        timer.now = 9.9
+        assert cache.get(b"a") == b"1"
+
+        timer.now = 10.0
+        assert cache.get(b"a") is None
+        assert len(cache) == 0
+
+    def test_evicts_to_stay_within_max_bytes(self):
+        """Test old entries are evicted once stored bodies exceed max_bytes."""
+        cache = ResponseCache(maxsize=10, ttl=60, max_bytes=5)
+        cache.set(b"a", b"12")
+        cache.set(b"b", b"34")
+        cache.set(b"c", b"56")
+
+        assert cache.get(b"a") is None
+        assert cache.get(b"b") == b"34"
+        assert cache.size == 4
+
+    def test_body_larger_than_max_bytes_not_stored(self):
+        """Test a body that can never fit is skipped without evicting others."""
+        cache = ResponseCache(maxsize=10, ttl=60, max_bytes=4)
+        cache.set(b"a", b"12")
+        cache.set(b"b", b"12345")
+
+        assert cache.get(b"a") == b"12"
+        assert cache.get(b"b") is None
+
+    def test_overwrite_updates_size(self):
+        """Test replacing an entry accounts for the old body's size."""
+        cache = ResponseCache(maxsize=10, ttl=60, max_bytes=10)
+        cache.set(b"a", b"123456")
+        cache.set(b"a", b"12")
+
+        assert cache.size == 2
+        assert len(cache) == 1
+
+    def test_zero_size_disables_cache(self):
+        """Test a zero-size cache stores nothing."""
+        cache = ResponseCache(maxsize=0, ttl=60)
+        cache.set(b"a", b"1")
+
+        assert not cache.enabled
+        assert cache.get(b"a") is None
+        assert len(cache) == 0
+
+    def test_clear(self):
+        """Test clear drops every entry."""
+        cache = ResponseCache(maxsize=2, ttl=60)
+        cache.set(b"a", b"1")
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.size == 0